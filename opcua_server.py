@@ -9,6 +9,7 @@ License: MIT
 
 from opcua import Server
 import json
+import math
 import time
 import random
 import os
@@ -256,7 +257,7 @@ class OPCUAServer:
             if tag_name in self.tags:
                 var = self.tags[tag_name]["variable"]
                 var.set_value(value)
-                self.logger.debug(f"Wrote transformed tag {tag_name} = {value}")
+                self.logger.debug("Wrote transformed tag %s = %s", tag_name, value)
             else:
                 # Create new tag for transformed/computed values
                 if self.server:
@@ -290,6 +291,7 @@ class OPCUAServer:
     def update_tags(self):
         """Update tag values based on simulation configuration."""
         timestamp = time.time()
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         
         for tag_name, tag_data in self.tags.items():
             try:
@@ -302,22 +304,26 @@ class OPCUAServer:
                     continue
                 
                 sim_type = config.get("simulation_type", "random")
-                current_value = var.get_value()
+                # Only increment and the debug log need the previous value
+                current_value = var.get_value() if debug or sim_type == "increment" else None
                 
                 if sim_type == "random":
                     new_value = self.generate_random_value(config, tag_type)
                     var.set_value(new_value)
-                    self.logger.debug(f"{tag_name}: {current_value} -> {new_value}")
+                    if debug:
+                        self.logger.debug("%s: %s -> %s", tag_name, current_value, new_value)
                     
                 elif sim_type == "increment":
                     new_value = self.generate_increment_value(current_value, config, tag_type)
                     var.set_value(new_value)
-                    self.logger.debug(f"{tag_name}: {current_value} -> {new_value}")
+                    if debug:
+                        self.logger.debug("%s: %s -> %s", tag_name, current_value, new_value)
                     
                 elif sim_type == "sine":
                     new_value = self.generate_sine_value(config, tag_type)
                     var.set_value(new_value)
-                    self.logger.debug(f"{tag_name}: {current_value} -> {new_value}")
+                    if debug:
+                        self.logger.debug("%s: %s -> %s", tag_name, current_value, new_value)
                 
                 # Publish to all configured publishers (MQTT, REST API, etc.)
                 if self.publisher_manager:
@@ -388,8 +394,6 @@ class OPCUAServer:
         Returns:
             Sine wave value
         """
-        import math
-        
         amplitude = config.get("amplitude", 10)
         offset = config.get("offset", 0)
         period = config.get("period", 60)  # seconds
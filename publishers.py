@@ -7,26 +7,52 @@ Author: Your Friendly Neighborhood Engineer
 License: MIT
 """
 
+import fnmatch
+import functools
 import json
 import logging
 import os
+import random
+import struct
 import threading
 import time
 import requests  # For HTTP requests (Slack webhooks, etc.)
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List, Tuple
 import paho.mqtt.client as mqtt
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.serving import make_server
 
 try:
-    from sparkplug_b import *
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    from waitress import create_server as create_waitress_server
+    from waitress import wasyncore
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+try:
+    import sparkplug_b
     SPARKPLUG_AVAILABLE = True
 except ImportError:
     SPARKPLUG_AVAILABLE = False
 
 try:
     from kafka import KafkaProducer
+    from kafka import codec as kafka_codec
     KAFKA_AVAILABLE = True
 except ImportError:
     KAFKA_AVAILABLE = False
@@ -47,7 +73,6 @@ try:
     from pymodbus.server import StartTcpServer
     from pymodbus.datastore import ModbusSequentialDataBlock, ModbusSlaveContext, ModbusServerContext
     from pymodbus.device import ModbusDeviceIdentification
-    import struct
     MODBUS_AVAILABLE = True
 except ImportError:
     MODBUS_AVAILABLE = False
@@ -61,24 +86,27 @@ except ImportError:
 
 try:
     import graphene
-    from flask_graphql import GraphQLView
+    from graphql import GraphQLError, execute, parse, validate
     GRAPHQL_AVAILABLE = True
 except ImportError:
     GRAPHQL_AVAILABLE = False
 
 try:
-    from influxdb_client import InfluxDBClient, Point, WritePrecision
-    from influxdb_client.client.write_api import SYNCHRONOUS
+    from influxdb_client import InfluxDBClient, WritePrecision
+    from influxdb_client.client.write_api import WriteOptions
     INFLUXDB_AVAILABLE = True
 except ImportError:
     INFLUXDB_AVAILABLE = False
 
 # Email and notification libraries (mostly built-in)
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 from datetime import datetime, timedelta
-from collections import deque
+from collections import deque, namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from array import array
 
 try:
     from twilio.rest import Client as TwilioClient
@@ -96,9 +124,402 @@ import sqlite3
 import threading
 import re
 import math
+import operator
 from typing import Callable
 
 
+# Payload codecs shared by the message bus publishers (MQTT, Sparkplug, Kafka,
+# AMQP) and WebSocket. Every encoder returns bytes so the result can go
+# straight to the wire.
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+elif MSGSPEC_AVAILABLE:
+    _json_dumps = msgspec.json.Encoder().encode
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+_MSGPACK_ENC = msgspec.msgpack.Encoder() if MSGSPEC_AVAILABLE else None
+
+
+def _get_payload_encoder(payload_format: str, logger: logging.Logger) -> Callable[[Any], bytes]:
+    """
+    Resolve a payload format name to an encoder.
+    
+    Args:
+        payload_format: "json", "orjson", "msgpack" or "binary" (JSON is the
+            encoder for updates that don't fit a binary frame)
+        logger: Logger used to report a missing codec library
+        
+    Returns:
+        Callable that serializes a payload object to bytes
+    """
+    if payload_format == "msgpack":
+        if MSGSPEC_AVAILABLE:
+            return _MSGPACK_ENC.encode
+        logger.warning("msgspec not available, falling back to JSON payloads. Install with: pip install msgspec")
+    elif payload_format == "orjson" and not ORJSON_AVAILABLE:
+        logger.warning("orjson not available, using stdlib JSON. Install with: pip install orjson")
+    return _json_dumps
+
+
+# payload_format "binary": int/float updates are sent as fixed 18-byte records
+# of tag id (uint16), timestamp in ns (uint64) and value (float64), big endian.
+# bool and everything else still goes out as JSON.
+_BINARY_FRAME = struct.Struct(">HQd")
+_BINARY_TYPES = frozenset((int, float))
+
+
+class _TagIdMap:
+    """
+    Tag name to binary frame id assignment, first seen gets the next id.
+    
+    Readers look up ``ids`` directly and only call assign() for a miss.
+    Consumers resolve ids from the ``{"ids": {name: id}}`` announcements the
+    publishers send.
+    """
+    
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def assign(self, tag_name: str) -> Optional[int]:
+        """Return the id of tag_name, assigning one if needed; None once all 65536 are used."""
+        with self._lock:
+            tid = self.ids.get(tag_name)
+            if tid is None and len(self.ids) <= 0xFFFF:
+                tid = self.ids[tag_name] = len(self.ids)
+        return tid
+    
+    def announcement(self) -> Dict[str, Any]:
+        """Full id map in announcement form."""
+        return {"ids": dict(self.ids)}
+
+
+if ORJSON_AVAILABLE:
+    class ORJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson, used for jsonify() responses."""
+        
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            option = orjson.OPT_NON_STR_KEYS
+            if kwargs.get("sort_keys", self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        
+        def loads(self, s: Any, **kwargs: Any) -> Any:
+            return orjson.loads(s)
+
+
+def _make_wsgi_server(app: Flask, host: str, port: int, threads: int) -> Tuple[Callable[[], None], Callable[[], None]]:
+    """
+    Bind an embedded WSGI server for a Flask app.
+    
+    Uses waitress when installed, otherwise Werkzeug's threaded server.
+    
+    Args:
+        app: Flask application to serve
+        host: Interface to bind
+        port: TCP port to bind
+        threads: Worker threads (waitress only)
+        
+    Returns:
+        (run, close) pair: run() serves until close() is called from another thread
+    """
+    if WAITRESS_AVAILABLE:
+        server = create_waitress_server(app, host=host, port=port, threads=threads, channel_timeout=30)
+        
+        def close_waitress():
+            # server.close() only closes the listener; drop keep-alive channels
+            # and workers too so run() returns promptly
+            server.task_dispatcher.shutdown()
+            wasyncore.close_all(server._map)
+        
+        return server.run, close_waitress
+    
+    server = make_server(host, port, app, threaded=True)
+    
+    def close():
+        server.shutdown()
+        server.server_close()
+    
+    return server.serve_forever, close
+
+
+class _PublishQueue:
+    """
+    Bounded buffer drained in batches by a background flusher thread.
+
+    Producers never block: once the buffer is full the oldest entry is dropped
+    and counted. The flusher hands lists of up to batch_size entries to
+    flush_fn every flush_ms milliseconds, or as soon as a full batch is waiting.
+    """
+
+    def __init__(self, flush_fn: Callable[[list], None], batch_size: int = 64, flush_ms: float = 10,
+                 max_len: int = 100000, name: str = "publish-flusher",
+                 logger: Optional[logging.Logger] = None):
+        self._flush_fn = flush_fn
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.001, flush_ms / 1000.0)
+        self.max_len = max_len
+        self.dropped = 0
+        self.name = name
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._items = deque(maxlen=max_len)
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Any):
+        """Queue an item for the next flush, dropping the oldest one if full."""
+        items = self._items
+        if len(items) == self.max_len:
+            self.dropped += 1
+        items.append(item)
+        if len(items) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self):
+        """Start the flusher thread."""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the flusher thread and flush whatever is still queued."""
+        self._running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self._drain()
+
+    def _drain(self):
+        items = self._items
+        popleft = items.popleft
+        while items:
+            batch = [popleft() for _ in range(min(len(items), self.batch_size))]
+            try:
+                self._flush_fn(batch)
+            except Exception as e:
+                self.logger.error("Error flushing %d queued messages: %s", len(batch), e)
+
+    def _run(self):
+        while self._running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+
+
+class _MqttConnectionPool:
+    """
+    Shares one paho client, and its network loop thread, between publishers
+    that connect to the same broker with the same client id.
+    
+    Connect/disconnect callbacks are fanned out to every publisher holding
+    the client. Incoming messages are routed to the publishers whose
+    registered topic prefix matches, looked up by first topic segment.
+    """
+    
+    _entries: Dict[tuple, Dict[str, Any]] = {}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def acquire(cls, owner: Any, broker: str, port: int, client_id: str,
+                configure: Optional[Callable] = None, message_prefix: Optional[str] = None,
+                max_inflight: int = 1000, max_queued: int = 100000) -> "mqtt.Client":
+        """
+        Get a connected (or connecting) client for broker/port/client_id.
+        
+        Args:
+            owner: Publisher with on_connect/on_disconnect/on_message callbacks
+            broker: Broker host
+            port: Broker port
+            client_id: MQTT client id
+            configure: Called with a new client before connect (credentials,
+                TLS, will). Ignored when the client already exists.
+            message_prefix: Topic prefix whose messages go to owner.on_message
+            max_inflight: paho max in-flight QoS>0 messages for a new client
+            max_queued: paho max queued outgoing messages for a new client
+            
+        Returns:
+            Shared paho client
+        """
+        key = (broker, port, client_id)
+        with cls._lock:
+            entry = cls._entries.get(key)
+            created = entry is None
+            if created:
+                client = mqtt.Client(client_id=client_id)
+                entry = {"client": client, "owners": (), "routes": {}}
+                client.on_connect = functools.partial(cls._on_connect, entry)
+                client.on_disconnect = functools.partial(cls._on_disconnect, entry)
+                client.on_message = functools.partial(cls._on_message, entry)
+                client.max_inflight_messages_set(max_inflight)
+                client.max_queued_messages_set(max_queued)
+                if configure:
+                    configure(client)
+            else:
+                # Credentials, TLS and will of the first publisher stay in effect
+                owner.logger.info(f"Sharing existing MQTT connection to {broker}:{port} as '{client_id}'")
+            
+            entry["owners"] += ((owner, message_prefix),)
+            cls._rebuild_routes(entry)
+            client = entry["client"]
+            if created:
+                try:
+                    client.connect(broker, port, keepalive=60)
+                except Exception:
+                    entry["owners"] = ()
+                    raise
+                client.loop_start()
+                cls._entries[key] = entry
+            already_connected = not created and client.is_connected()
+        
+        if already_connected:
+            owner.on_connect(client, None, {}, 0)
+        return client
+    
+    @classmethod
+    def release(cls, owner: Any, client: "mqtt.Client"):
+        """Drop owner's hold on client; the last holder disconnects it."""
+        with cls._lock:
+            for key, entry in cls._entries.items():
+                if entry["client"] is client:
+                    break
+            else:
+                return
+            entry["owners"] = tuple(o for o in entry["owners"] if o[0] is not owner)
+            cls._rebuild_routes(entry)
+            if entry["owners"]:
+                return
+            del cls._entries[key]
+        
+        client.disconnect()
+        client.loop_stop()
+    
+    @staticmethod
+    def _rebuild_routes(entry: Dict[str, Any]):
+        routes = {}
+        for owner, prefix in entry["owners"]:
+            if prefix:
+                routes.setdefault(prefix.partition('/')[0], []).append((prefix, owner.on_message))
+        entry["routes"] = routes
+    
+    @staticmethod
+    def _on_connect(entry, client, userdata, flags, rc):
+        for owner, _ in entry["owners"]:
+            owner.on_connect(client, userdata, flags, rc)
+    
+    @staticmethod
+    def _on_disconnect(entry, client, userdata, rc):
+        for owner, _ in entry["owners"]:
+            owner.on_disconnect(client, userdata, rc)
+    
+    @staticmethod
+    def _on_message(entry, client, userdata, msg):
+        topic = msg.topic
+        for prefix, handler in entry["routes"].get(topic.partition('/')[0], ()):
+            if topic.startswith(prefix):
+                handler(client, userdata, msg)
+
+
+class _TagTable(Mapping):
+    """
+    Latest value per tag, stored as parallel arrays (structure of arrays).
+    
+    A tag gets a fixed slot the first time it is written and later writes
+    overwrite that slot in place, so steady-state updates allocate nothing
+    beyond the value itself. Written by the publish thread, read by any number
+    of HTTP worker threads without a lock: each slot carries a seqlock-style
+    version (odd while a write is in progress) and readers retry until they
+    see a stable one. The table-wide ``version`` changes on every write, which
+    lets readers cheaply detect that anything changed.
+    
+    Reads through the Mapping interface return {"value": ..., "timestamp": ...}
+    dicts, matching the old dict-of-dicts tag cache.
+    """
+    
+    def __init__(self):
+        self._index = {}
+        self.names = []
+        self._values = []
+        self._timestamps = array('d')
+        self._versions = array('Q')
+        self._grow_lock = threading.Lock()
+        self.version = 0
+    
+    def set(self, name: str, value: Any, timestamp: float):
+        """Store the latest value and timestamp for a tag."""
+        i = self._index.get(name)
+        if i is None:
+            i = self._add_slot(name)
+        versions = self._versions
+        versions[i] += 1
+        self._values[i] = value
+        self._timestamps[i] = timestamp
+        versions[i] += 1
+        self.version += 1
+    
+    def _add_slot(self, name: str) -> int:
+        with self._grow_lock:
+            i = self._index.get(name)
+            if i is None:
+                i = len(self.names)
+                self._values.append(None)
+                self._timestamps.append(0.0)
+                self._versions.append(0)
+                # Publish the name last so readers never see a half-built slot
+                self.names.append(name)
+                self._index[name] = i
+            return i
+    
+    def read(self, i: int) -> Tuple[Any, float]:
+        """Consistent (value, timestamp) pair for slot i."""
+        versions = self._versions
+        while True:
+            version = versions[i]
+            if not version & 1:
+                value = self._values[i]
+                timestamp = self._timestamps[i]
+                if versions[i] == version:
+                    return value, timestamp
+    
+    def index(self, name: str) -> Optional[int]:
+        """Slot of a tag, or None if it has never been written."""
+        return self._index.get(name)
+    
+    def get_record(self, name: str) -> Optional[Tuple[Any, float]]:
+        """(value, timestamp) for a tag, or None if it has never been written."""
+        i = self._index.get(name)
+        return None if i is None else self.read(i)
+    
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of all tags as {name: {"value": ..., "timestamp": ...}}."""
+        names = self.names
+        read = self.read
+        snapshot = {}
+        for i in range(len(names)):
+            value, timestamp = read(i)
+            snapshot[names[i]] = {"value": value, "timestamp": timestamp}
+        return snapshot
+    
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        value, timestamp = self.read(self._index[name])
+        return {"value": value, "timestamp": timestamp}
+    
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+    
+    def __iter__(self):
+        return iter(self.names[:])
+    
+    def __len__(self) -> int:
+        return len(self.names)
+
+
 class DataPublisher(ABC):
     """Base class for all data publishers."""
     
@@ -114,6 +535,8 @@ class DataPublisher(ABC):
         self.enabled = config.get("enabled", False)
         self.logger = logger or logging.getLogger(self.__class__.__name__)
         self.running = False
+        # Cached so hot publish paths can skip debug logging with one branch
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
         
     @abstractmethod
     def start(self):
@@ -137,6 +560,36 @@ class DataPublisher(ABC):
         """
         pass
 
+    def _create_publish_queue(self, flush_fn: Callable[[list], None], batch_size: int = 64) -> _PublishQueue:
+        """
+        Build a publish queue from the common batching settings.
+
+        Args:
+            flush_fn: Called from the flusher thread with a list of queued items
+            batch_size: Default for the batch_size setting
+
+        Returns:
+            Unstarted _PublishQueue
+        """
+        return _PublishQueue(
+            flush_fn,
+            batch_size=self.config.get("batch_size", batch_size),
+            flush_ms=self.config.get("flush_ms", 10),
+            max_len=self.config.get("batch_queue_max", 100000),
+            name=f"{self.__class__.__name__}-flusher",
+            logger=self.logger
+        )
+
+
+def _batch_frame(batch: list) -> Dict[str, Any]:
+    """
+    Wrap queued (tag, value, timestamp) tuples in a single batch payload.
+    
+    Entries queued without a timestamp share one clock read for the batch.
+    """
+    now = time.time()
+    return {"batch": [{"tag": tag, "value": value, "timestamp": ts or now} for tag, value, ts in batch]}
+
 
 class MQTTPublisher(DataPublisher):
     """MQTT Publisher for tag data."""
@@ -145,11 +598,34 @@ class MQTTPublisher(DataPublisher):
         super().__init__(config, logger)
         self.client = None
         self.connected = False
+        # Single flag checked by publish(): enabled and connected
+        self._ready = False
+        self.payload_format = config.get("payload_format", "json")
+        self._encode = _get_payload_encoder(self.payload_format, self.logger)
+        self.batch_publish = config.get("batch_publish", False)
+        self.conflate = config.get("conflate", True)
+        self._queue = None
+        
+        # Commands are passed to the callback as str, or untouched bytes with raw_bytes
+        self.command_callback = None
+        self.raw_bytes = config.get("raw_bytes", False)
+        
+        # JSON payloads are stitched together from a cached per-tag prefix
+        # instead of building and serializing a dict per update
+        self._use_template = self._encode is _json_dumps
+        self._json_prefixes = {}
+        
+        # Numeric updates as _BINARY_FRAME records on <topic_prefix>/_bin, the
+        # id map is kept retained on <topic_prefix>/_id_map
+        self._binary = self.payload_format == "binary"
+        self._tag_ids = _TagIdMap()
+        self._announced_ids = 0
         
     def on_connect(self, client, userdata, flags, rc):
         """Callback for when the client receives a CONNACK response."""
         if rc == 0:
             self.connected = True
+            self._ready = self.enabled
             self.logger.info("Connected to MQTT broker successfully")
             
             # Subscribe to command topics if configured
@@ -160,25 +636,30 @@ class MQTTPublisher(DataPublisher):
         else:
             self.logger.error(f"Failed to connect to MQTT broker, return code {rc}")
             self.connected = False
+            self._ready = False
     
     def on_disconnect(self, client, userdata, rc):
         """Callback for when the client disconnects."""
+        self._ready = False
         self.connected = False
         if rc != 0:
             self.logger.warning(f"Unexpected MQTT disconnection (rc={rc}). Attempting to reconnect...")
     
     def on_message(self, client, userdata, msg):
         """Callback for when a PUBLISH message is received."""
+        callback = self.command_callback
+        if callback is None:
+            return
+        
         try:
-            topic = msg.topic
-            payload = msg.payload.decode()
-            self.logger.info(f"Received MQTT message on {topic}: {payload}")
-            
             # Parse the command (could be used for write-back to OPC UA)
             # Format: command_topic/tag_name -> value
-            if hasattr(self, 'command_callback'):
-                tag_name = topic.split('/')[-1]
-                self.command_callback(tag_name, payload)
+            topic = msg.topic
+            tag_name = topic.rpartition('/')[2]
+            payload = msg.payload if self.raw_bytes else msg.payload.decode()
+            self.logger.info("Received MQTT message on %s: %s", topic, payload)
+            
+            callback(tag_name, payload)
                 
         except Exception as e:
             self.logger.error(f"Error processing MQTT message: {e}")
@@ -189,31 +670,53 @@ class MQTTPublisher(DataPublisher):
             self.logger.info("MQTT publisher is disabled")
             return
         
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
+        
+        # Config is static once running, resolve what publish() needs up front
+        self.topic_prefix = self.config.get("topic_prefix", "opcua")
+        self.qos = self.config.get("qos", 0)
+        self.retain = self.config.get("retain", False)
+        self._topics = {}
+        self._batch_topic = f"{self.topic_prefix}/_batch"
+        self._bin_topic = f"{self.topic_prefix}/_bin"
+        self._id_map_topic = f"{self.topic_prefix}/_id_map"
+        
         try:
             broker = self.config.get("broker", "localhost")
             port = self.config.get("port", 1883)
             client_id = self.config.get("client_id", "opcua_server")
+            command_topic = self.config.get("command_topic")
             
-            self.client = mqtt.Client(client_id=client_id)
-            self.client.on_connect = self.on_connect
-            self.client.on_disconnect = self.on_disconnect
-            self.client.on_message = self.on_message
-            
-            # Set username/password if provided
-            username = self.config.get("username")
-            password = self.config.get("password")
-            if username and password:
-                self.client.username_pw_set(username, password)
-            
-            # Configure TLS if specified
-            use_tls = self.config.get("use_tls", False)
-            if use_tls:
-                ca_certs = self.config.get("ca_certs")
-                self.client.tls_set(ca_certs=ca_certs)
+            def configure(client):
+                # Set username/password if provided
+                username = self.config.get("username")
+                password = self.config.get("password")
+                if username and password:
+                    client.username_pw_set(username, password)
+                
+                # Configure TLS if specified
+                use_tls = self.config.get("use_tls", False)
+                if use_tls:
+                    ca_certs = self.config.get("ca_certs")
+                    client.tls_set(ca_certs=ca_certs)
+            
+            # publish() only enqueues; a dedicated thread drains the queue so a
+            # stalled broker never blocks the tag update loop
+            if self.batch_publish:
+                self._queue = self._create_publish_queue(self._flush_batch)
+            else:
+                self._queue = self._create_publish_queue(self._flush_each, batch_size=1000)
             
             self.logger.info(f"Connecting to MQTT broker at {broker}:{port}")
-            self.client.connect(broker, port, keepalive=60)
-            self.client.loop_start()
+            self.client = _MqttConnectionPool.acquire(
+                self, broker, port, client_id,
+                configure=configure,
+                message_prefix=f"{command_topic}/" if command_topic else None,
+                max_inflight=self.config.get("max_inflight", 1000),
+                max_queued=self.config.get("max_queued", 100000)
+            )
+            
+            self._queue.start()
             self.running = True
             
         except Exception as e:
@@ -223,8 +726,12 @@ class MQTTPublisher(DataPublisher):
     def stop(self):
         """Stop the MQTT publisher."""
         if self.client and self.running:
-            self.client.loop_stop()
-            self.client.disconnect()
+            self._ready = False
+            if self._queue:
+                self._queue.stop()
+                self._queue = None
+            _MqttConnectionPool.release(self, self.client)
+            self.connected = False
             self.running = False
             self.logger.info("MQTT publisher stopped")
     
@@ -237,36 +744,84 @@ class MQTTPublisher(DataPublisher):
             value: Tag value
             timestamp: Optional timestamp
         """
-        if not self.enabled or not self.connected:
+        if not self._ready:
             return
         
+        self._queue.put((tag_name, value, timestamp))
+    
+    def _flush_each(self, batch: list):
+        """
+        Publish queued updates as individual per-tag messages.
+        
+        With conflate enabled (the default) only the newest queued value of
+        each tag is sent.
+        """
+        if self.conflate:
+            latest = {}
+            for tag_name, value, timestamp in batch:
+                latest[tag_name] = (value, timestamp)
+            batch = [(tag_name, value, timestamp) for tag_name, (value, timestamp) in latest.items()]
+        
+        now = time.time()
+        publish_one = self._publish_one
+        for tag_name, value, timestamp in batch:
+            publish_one(tag_name, value, timestamp or now)
+        
+        # Announce new binary ids once per flush rather than once per tag
+        if self._binary and len(self._tag_ids.ids) != self._announced_ids:
+            self._announced_ids = len(self._tag_ids.ids)
+            self.client.publish(self._id_map_topic, _json_dumps(self._tag_ids.announcement()), qos=1, retain=True)
+    
+    def _publish_one(self, tag_name: str, value: Any, timestamp: float):
+        """Format and hand one tag update to the paho client."""
         try:
-            topic_prefix = self.config.get("topic_prefix", "opcua")
-            topic = f"{topic_prefix}/{tag_name}"
+            if self._binary and type(value) in _BINARY_TYPES:
+                tid = self._tag_ids.ids.get(tag_name)
+                if tid is None:
+                    tid = self._tag_ids.assign(tag_name)
+                if tid is not None:
+                    payload = _BINARY_FRAME.pack(tid, int(timestamp * 1e9), value)
+                    self.client.publish(self._bin_topic, payload, qos=self.qos)
+                    return
+            
+            topic = self._topics.get(tag_name)
+            if topic is None:
+                topic = self._topics[tag_name] = f"{self.topic_prefix}/{tag_name}"
             
             # Create payload
-            payload_format = self.config.get("payload_format", "json")
-            
-            if payload_format == "json":
+            if self.payload_format == "string":
+                # Simple string format
+                payload = str(value)
+            elif self._use_template:
+                prefix = self._json_prefixes.get(tag_name)
+                if prefix is None:
+                    prefix = self._json_prefixes[tag_name] = b'{"tag":' + _json_dumps(tag_name) + b',"value":'
+                payload = b"".join((
+                    prefix,
+                    _json_dumps(value),
+                    b',"timestamp":',
+                    repr(timestamp).encode(),
+                    b"}"
+                ))
+            else:
                 payload_data = {
                     "tag": tag_name,
                     "value": value,
-                    "timestamp": timestamp or time.time()
+                    "timestamp": timestamp
                 }
-                payload = json.dumps(payload_data)
-            else:
-                # Simple string format
-                payload = str(value)
+                payload = self._encode(payload_data)
             
-            qos = self.config.get("qos", 0)
-            retain = self.config.get("retain", False)
-            
-            self.client.publish(topic, payload, qos=qos, retain=retain)
-            self.logger.debug(f"Published to MQTT: {topic} = {payload}")
+            self.client.publish(topic, payload, qos=self.qos, retain=self.retain)
+            if self._debug:
+                self.logger.debug("Published to MQTT: %s = %s", topic, payload)
             
         except Exception as e:
             self.logger.error(f"Error publishing to MQTT: {e}")
     
+    def _flush_batch(self, batch: list):
+        """Publish queued tag updates as one message on <topic_prefix>/_batch."""
+        self.client.publish(self._batch_topic, self._encode(_batch_frame(batch)), qos=self.qos)
+    
     def set_command_callback(self, callback):
         """Set callback function for handling incoming commands."""
         self.command_callback = callback
@@ -281,8 +836,20 @@ class RESTAPIPublisher(DataPublisher):
                         template_folder='templates',
                         static_folder='static')
         CORS(self.app)
+        if ORJSON_AVAILABLE:
+            self.app.json = ORJSONProvider(self.app)
         self.server_thread = None
-        self.tag_cache = {}
+        self._close_server = None
+        self.tag_cache = _TagTable()
+        
+        # Pre-serialized (body, etag) for /api/tags, rebuilt only after the
+        # table changes and at most once per refresh_ms
+        self._tags_body = None
+        self._etag_prefix = f"{time.time_ns():x}"
+        self._tags_body_version = -1
+        self._tags_body_built = 0.0
+        self._tags_body_lock = threading.Lock()
+        self.refresh_interval = config.get("refresh_ms", 0) / 1000.0
         self.write_callback = None
         
         # Register Web UI Blueprint
@@ -318,11 +885,17 @@ class RESTAPIPublisher(DataPublisher):
         
         @self.app.route('/api/tags', methods=['GET'])
         def get_all_tags():
-            """Get all tag values."""
-            return jsonify({
-                "tags": self.tag_cache,
-                "count": len(self.tag_cache)
-            })
+            """Get all tag values, or only their names with ?fields=names."""
+            if request.args.get("fields") == "names":
+                # Names are append-only, so the count identifies the listing
+                names = self.tag_cache.names[:]
+                response = jsonify({"tags": names, "count": len(names)})
+                response.set_etag(f"{self._etag_prefix}-n{len(names)}")
+            else:
+                body, etag = self._get_tags_body()
+                response = Response(body, mimetype="application/json")
+                response.set_etag(etag)
+            return response.make_conditional(request)
         
         @self.app.route('/api/tags/<tag_name>', methods=['GET'])
         def get_tag(tag_name):
@@ -500,6 +1073,26 @@ class RESTAPIPublisher(DataPublisher):
                 self.logger.error(f"Error generating metrics: {e}")
                 return jsonify({"error": str(e)}), 500
     
+    def _get_tags_body(self) -> Tuple[bytes, str]:
+        """Serialized {"tags": ..., "count": ...} body for /api/tags and its ETag."""
+        version = self.tag_cache.version
+        if version == self._tags_body_version:
+            return self._tags_body
+        
+        with self._tags_body_lock:
+            if self._tags_body_version == version:
+                return self._tags_body
+            now = time.monotonic()
+            if self._tags_body is not None and now - self._tags_body_built < self.refresh_interval:
+                return self._tags_body
+            
+            tags = self.tag_cache.to_dict()
+            body = self.app.json.dumps({"tags": tags, "count": len(tags)}).encode('utf-8')
+            self._tags_body = (body, f"{self._etag_prefix}-{version}")
+            self._tags_body_version = version
+            self._tags_body_built = now
+            return self._tags_body
+    
     def start(self):
         """Start the REST API server."""
         if not self.enabled:
@@ -510,14 +1103,16 @@ class RESTAPIPublisher(DataPublisher):
             host = self.config.get("host", "0.0.0.0")
             port = self.config.get("port", 5000)
             
-            def run_server():
-                self.app.run(host=host, port=port, debug=False, use_reloader=False)
+            # Bind here so port errors surface from start() rather than the thread
+            run_server, self._close_server = _make_wsgi_server(
+                self.app, host, port, self.config.get("threads", 16)
+            )
             
             self.server_thread = threading.Thread(target=run_server, daemon=True)
             self.server_thread.start()
             self.running = True
             
-            self.logger.info(f"REST API started on http://{host}:{port}")
+            self.logger.info(f"REST API started on http://{host}:{port} ({'waitress' if WAITRESS_AVAILABLE else 'werkzeug'})")
             
         except Exception as e:
             self.logger.error(f"Failed to start REST API: {e}")
@@ -525,8 +1120,12 @@ class RESTAPIPublisher(DataPublisher):
     
     def stop(self):
         """Stop the REST API server."""
-        # Flask doesn't have a clean shutdown in this mode
-        # In production, use a proper WSGI server
+        if self._close_server:
+            try:
+                self._close_server()
+            except Exception as e:
+                self.logger.warning(f"Error closing REST API server: {e}")
+            self._close_server = None
         self.running = False
         self.logger.info("REST API publisher stopped")
     
@@ -542,21 +1141,33 @@ class RESTAPIPublisher(DataPublisher):
         if not self.enabled:
             return
         
-        self.tag_cache[tag_name] = {
-            "value": value,
-            "timestamp": timestamp or time.time()
-        }
+        self.tag_cache.set(tag_name, value, timestamp or time.time())
     
     def set_write_callback(self, callback):
         """Set callback function for handling write requests."""
         self.write_callback = callback
 
 
+# Python type -> Sparkplug metric datatype. Keyed on the exact type so bool
+# does not fall through to int.
+if SPARKPLUG_AVAILABLE:
+    _SPARKPLUG_DATATYPES = {
+        bool: sparkplug_b.MetricDataType.Boolean,
+        int: sparkplug_b.MetricDataType.Int32,
+        float: sparkplug_b.MetricDataType.Float,
+        str: sparkplug_b.MetricDataType.String,
+    }
+else:
+    _SPARKPLUG_DATATYPES = {}
+
+
 class SparkplugBPublisher(DataPublisher):
     """Sparkplug B Publisher for Ignition Edge and SCADA systems."""
     
     def __init__(self, config: Dict[str, Any], logger: Optional[logging.Logger] = None):
         super().__init__(config, logger)
+        # Single flag checked by publish(): library present, enabled and connected
+        self._ready = False
         if not SPARKPLUG_AVAILABLE:
             self.logger.warning("Sparkplug B library not available. Install with: pip install sparkplug-b")
             self.enabled = False
@@ -577,6 +1188,7 @@ class SparkplugBPublisher(DataPublisher):
         """Callback for when the client receives a CONNACK response."""
         if rc == 0:
             self.connected = True
+            self._ready = self.enabled
             self.logger.info("Connected to Sparkplug B broker successfully")
             
             # Send NBIRTH (Node Birth) message
@@ -586,9 +1198,11 @@ class SparkplugBPublisher(DataPublisher):
         else:
             self.logger.error(f"Failed to connect to Sparkplug B broker, return code {rc}")
             self.connected = False
+            self._ready = False
     
     def on_disconnect(self, client, userdata, rc):
         """Callback for when the client disconnects."""
+        self._ready = False
         self.connected = False
         if rc != 0:
             self.logger.warning(f"Unexpected Sparkplug B disconnection (rc={rc})")
@@ -599,26 +1213,16 @@ class SparkplugBPublisher(DataPublisher):
             return
             
         try:
-            group_id = self.config.get("group_id", "Sparkplug B Devices")
-            edge_node_id = self.config.get("edge_node_id", "OPC_UA_Gateway")
+            topic = self._nbirth_topic
             
-            topic = f"spBv1.0/{group_id}/NBIRTH/{edge_node_id}"
+            # NBIRTH restarts the sequence and must carry the current bdSeq
+            self.sequence_number = 0
+            payload = sparkplug_b.getNodeBirthPayload()
+            payload.seq = self.get_next_sequence()
+            sparkplug_b.addMetric(payload, "bdSeq", None, sparkplug_b.MetricDataType.Int64, self.bdSeq)
+            sparkplug_b.addMetric(payload, "Node Control/Rebirth", None, sparkplug_b.MetricDataType.Boolean, False)
             
-            # Create minimal NBIRTH payload
-            payload = {
-                "timestamp": int(time.time() * 1000),
-                "metrics": [
-                    {
-                        "name": "Node Control/Rebirth",
-                        "timestamp": int(time.time() * 1000),
-                        "dataType": "Boolean",
-                        "value": False
-                    }
-                ],
-                "seq": self.get_next_sequence()
-            }
-            
-            self.client.publish(topic, json.dumps(payload), qos=0, retain=False)
+            self.client.publish(topic, payload.SerializeToString(), qos=0, retain=False)
             self.logger.info(f"Sent NBIRTH to {topic}")
             
         except Exception as e:
@@ -630,25 +1234,36 @@ class SparkplugBPublisher(DataPublisher):
             return
             
         try:
-            group_id = self.config.get("group_id", "Sparkplug B Devices")
-            edge_node_id = self.config.get("edge_node_id", "OPC_UA_Gateway")
-            device_id = self.config.get("device_id", "EdgeDevice")
-            
-            topic = f"spBv1.0/{group_id}/DBIRTH/{edge_node_id}/{device_id}"
+            topic = self._dbirth_topic
             
             # Create DBIRTH payload with metrics
-            payload = {
-                "timestamp": int(time.time() * 1000),
-                "metrics": [],
-                "seq": self.get_next_sequence()
-            }
+            payload = sparkplug_b.getDeviceBirthPayload()
+            payload.seq = self.get_next_sequence()
             
-            self.client.publish(topic, json.dumps(payload), qos=0, retain=False)
+            self.client.publish(topic, payload.SerializeToString(), qos=0, retain=False)
             self.logger.info(f"Sent DBIRTH to {topic}")
             
         except Exception as e:
             self.logger.error(f"Error sending DBIRTH: {e}")
     
+    def _build_topics(self):
+        """Build the fixed Sparkplug topic namespace for this edge node/device."""
+        group_id = self.config.get("group_id", "Sparkplug B Devices")
+        edge_node_id = self.config.get("edge_node_id", "OPC_UA_Gateway")
+        device_id = self.config.get("device_id", "EdgeDevice")
+        
+        self._nbirth_topic = f"spBv1.0/{group_id}/NBIRTH/{edge_node_id}"
+        self._ndeath_topic = f"spBv1.0/{group_id}/NDEATH/{edge_node_id}"
+        self._dbirth_topic = f"spBv1.0/{group_id}/DBIRTH/{edge_node_id}/{device_id}"
+        self._ddata_topic = f"spBv1.0/{group_id}/DDATA/{edge_node_id}/{device_id}"
+    
+    def _death_payload(self) -> bytes:
+        """Serialized NDEATH payload carrying the current bdSeq."""
+        payload = sparkplug_b.Payload()
+        payload.timestamp = int(time.time() * 1000)
+        sparkplug_b.addMetric(payload, "bdSeq", None, sparkplug_b.MetricDataType.Int64, self.bdSeq)
+        return payload.SerializeToString()
+    
     def start(self):
         """Start the Sparkplug B publisher."""
         if not self.enabled or not SPARKPLUG_AVAILABLE:
@@ -658,35 +1273,33 @@ class SparkplugBPublisher(DataPublisher):
                 self.logger.info("Sparkplug B publisher is disabled")
             return
         
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
         try:
             broker = self.config.get("broker", "localhost")
             port = self.config.get("port", 1883)
             group_id = self.config.get("group_id", "Sparkplug B Devices")
             edge_node_id = self.config.get("edge_node_id", "OPC_UA_Gateway")
             
-            client_id = f"{group_id}_{edge_node_id}"
-            
-            self.client = mqtt.Client(client_id=client_id)
-            self.client.on_connect = self.on_connect
-            self.client.on_disconnect = self.on_disconnect
-            
-            # Set username/password if provided
-            username = self.config.get("username")
-            password = self.config.get("password")
-            if username and password:
-                self.client.username_pw_set(username, password)
+            client_id = self.config.get("client_id", f"{group_id}_{edge_node_id}")
+            self._build_topics()
             
-            # Configure NDEATH (Node Death) certificate as LWT
-            ndeath_topic = f"spBv1.0/{group_id}/NDEATH/{edge_node_id}"
-            ndeath_payload = {
-                "timestamp": int(time.time() * 1000),
-                "bdSeq": self.bdSeq
-            }
-            self.client.will_set(ndeath_topic, json.dumps(ndeath_payload), qos=0, retain=False)
+            def configure(client):
+                # Set username/password if provided
+                username = self.config.get("username")
+                password = self.config.get("password")
+                if username and password:
+                    client.username_pw_set(username, password)
+                
+                # Configure NDEATH (Node Death) certificate as LWT
+                client.will_set(self._ndeath_topic, self._death_payload(), qos=0, retain=False)
             
             self.logger.info(f"Connecting to Sparkplug B broker at {broker}:{port}")
-            self.client.connect(broker, port, keepalive=60)
-            self.client.loop_start()
+            self.client = _MqttConnectionPool.acquire(
+                self, broker, port, client_id,
+                configure=configure,
+                max_inflight=self.config.get("max_inflight", 1000),
+                max_queued=self.config.get("max_queued", 100000)
+            )
             self.running = True
             
         except Exception as e:
@@ -696,22 +1309,15 @@ class SparkplugBPublisher(DataPublisher):
     def stop(self):
         """Stop the Sparkplug B publisher."""
         if self.client and self.running:
+            self._ready = False
             # Send NDEATH before disconnecting
             try:
-                group_id = self.config.get("group_id", "Sparkplug B Devices")
-                edge_node_id = self.config.get("edge_node_id", "OPC_UA_Gateway")
-                
-                topic = f"spBv1.0/{group_id}/NDEATH/{edge_node_id}"
-                payload = {
-                    "timestamp": int(time.time() * 1000),
-                    "bdSeq": self.bdSeq
-                }
-                self.client.publish(topic, json.dumps(payload), qos=0, retain=False)
+                self.client.publish(self._ndeath_topic, self._death_payload(), qos=0, retain=False)
             except:
                 pass
                 
-            self.client.loop_stop()
-            self.client.disconnect()
+            _MqttConnectionPool.release(self, self.client)
+            self.connected = False
             self.running = False
             self.logger.info("Sparkplug B publisher stopped")
     
@@ -724,45 +1330,28 @@ class SparkplugBPublisher(DataPublisher):
             value: Tag value
             timestamp: Optional timestamp
         """
-        if not self.enabled or not self.connected or not SPARKPLUG_AVAILABLE:
+        if not self._ready:
             return
         
         try:
-            group_id = self.config.get("group_id", "Sparkplug B Devices")
-            edge_node_id = self.config.get("edge_node_id", "OPC_UA_Gateway")
-            device_id = self.config.get("device_id", "EdgeDevice")
-            
-            topic = f"spBv1.0/{group_id}/DDATA/{edge_node_id}/{device_id}"
-            
-            # Determine Sparkplug data type
-            if isinstance(value, bool):
-                datatype = "Boolean"
-            elif isinstance(value, int):
-                datatype = "Int32"
-            elif isinstance(value, float):
-                datatype = "Float"
-            elif isinstance(value, str):
-                datatype = "String"
-            else:
-                datatype = "String"
+            # Determine Sparkplug data type, anything unknown goes out as a string
+            datatype = _SPARKPLUG_DATATYPES.get(type(value))
+            if datatype is None:
+                datatype = sparkplug_b.MetricDataType.String
                 value = str(value)
             
             # Create DDATA payload
-            payload = {
-                "timestamp": int((timestamp or time.time()) * 1000),
-                "metrics": [
-                    {
-                        "name": tag_name,
-                        "timestamp": int((timestamp or time.time()) * 1000),
-                        "dataType": datatype,
-                        "value": value
-                    }
-                ],
-                "seq": self.get_next_sequence()
-            }
-            
-            self.client.publish(topic, json.dumps(payload), qos=0, retain=False)
-            self.logger.debug(f"Published Sparkplug B DDATA: {tag_name} = {value}")
+            # One millisecond timestamp shared by the payload and its metric
+            ts_ms = int(timestamp * 1000) if timestamp else time.time_ns() // 1_000_000
+            payload = sparkplug_b.getDdataPayload()
+            payload.timestamp = ts_ms
+            payload.seq = self.get_next_sequence()
+            metric = sparkplug_b.addMetric(payload, tag_name, None, datatype, value)
+            metric.timestamp = ts_ms
+            
+            self.client.publish(self._ddata_topic, payload.SerializeToString(), qos=0, retain=False)
+            if self._debug:
+                self.logger.debug("Published Sparkplug B DDATA: %s = %s", tag_name, value)
             
         except Exception as e:
             self.logger.error(f"Error publishing to Sparkplug B: {e}")
@@ -779,6 +1368,9 @@ class KafkaPublisher(DataPublisher):
             return
             
         self.producer = None
+        self._encode = _get_payload_encoder(config.get("payload_format", "json"), self.logger)
+        self.batch_publish = config.get("batch_publish", False)
+        self._queue = None
         
     def start(self):
         """Start the Kafka publisher."""
@@ -796,12 +1388,35 @@ class KafkaPublisher(DataPublisher):
             if isinstance(bootstrap_servers, str):
                 bootstrap_servers = [bootstrap_servers]
             
+            # lz4/zstd/snappy need their codec packages installed, gzip is always there
+            compression = self.config.get("compression", "lz4")
+            codec_checks = {
+                "lz4": kafka_codec.has_lz4,
+                "zstd": kafka_codec.has_zstd,
+                "snappy": kafka_codec.has_snappy
+            }
+            if compression in codec_checks and not codec_checks[compression]():
+                self.logger.warning(f"Kafka {compression} codec not installed, falling back to gzip")
+                compression = "gzip"
+            
+            # Let the producer accumulate sends into large record batches
+            # instead of writing to the socket per tag
             self.producer = KafkaProducer(
                 bootstrap_servers=bootstrap_servers,
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                compression_type=self.config.get("compression", "gzip")
+                value_serializer=self._encode,
+                compression_type=compression,
+                acks=self.config.get("acks", 1),
+                linger_ms=self.config.get("linger_ms", 10),
+                batch_size=self.config.get("batch_size_bytes", 131072),
+                max_in_flight_requests_per_connection=self.config.get("max_in_flight", 5)
             )
             
+            self.topic = self.config.get("topic", "industrial-data")
+            self._keys = {}
+            
+            if self.batch_publish:
+                self._queue = self._create_publish_queue(self._flush_batch)
+                self._queue.start()
             self.running = True
             self.logger.info(f"Kafka publisher started with brokers: {bootstrap_servers}")
             
@@ -812,6 +1427,9 @@ class KafkaPublisher(DataPublisher):
     def stop(self):
         """Stop the Kafka publisher."""
         if self.producer and self.running:
+            if self._queue:
+                self._queue.stop()
+                self._queue = None
             self.producer.flush()
             self.producer.close()
             self.running = False
@@ -829,9 +1447,11 @@ class KafkaPublisher(DataPublisher):
         if not self.enabled or not self.running or not KAFKA_AVAILABLE:
             return
         
+        if self._queue is not None:
+            self._queue.put((tag_name, value, timestamp))
+            return
+        
         try:
-            topic = self.config.get("topic", "industrial-data")
-            
             # Create message payload
             message = {
                 "tag": tag_name,
@@ -840,13 +1460,18 @@ class KafkaPublisher(DataPublisher):
             }
             
             # Include tag name as key for partitioning
-            key = tag_name.encode('utf-8')
+            key = self._keys.get(tag_name)
+            if key is None:
+                key = self._keys[tag_name] = tag_name.encode('utf-8')
             
-            self.producer.send(topic, value=message, key=key)
-            self.logger.debug(f"Published to Kafka: {tag_name} = {value}")
+            self.producer.send(self.topic, value=message, key=key)
             
         except Exception as e:
             self.logger.error(f"Error publishing to Kafka: {e}")
+    
+    def _flush_batch(self, batch: list):
+        """Send queued tag updates as a single Kafka record."""
+        self.producer.send(self.topic, value=_batch_frame(batch))
 
 
 class AMQPPublisher(DataPublisher):
@@ -861,6 +1486,24 @@ class AMQPPublisher(DataPublisher):
             
         self.connection = None
         self.channel = None
+        self.io_thread = None
+        self._encode = _get_payload_encoder(config.get("payload_format", "json"), self.logger)
+        self._content_type = "application/json" if self._encode is _json_dumps else "application/msgpack"
+        self.batch_publish = config.get("batch_publish", False)
+        self._queue = None
+        
+        # Publisher confirms: "none" or "async" (acks handled on the IO loop)
+        self.confirm_mode = config.get("confirm_mode", "async")
+        if self.confirm_mode == "batch":
+            self.logger.info("AMQP confirm_mode 'batch' is handled as 'async' (confirms never block publish)")
+            self.confirm_mode = "async"
+        elif self.confirm_mode not in ("none", "async"):
+            self.logger.warning(f"Unknown AMQP confirm_mode '{self.confirm_mode}', using 'async'")
+            self.confirm_mode = "async"
+        self._ready = threading.Event()
+        self._closing = False
+        self._delivery_tag = 0
+        self._pending = {}
         
     def start(self):
         """Start the AMQP publisher."""
@@ -871,6 +1514,7 @@ class AMQPPublisher(DataPublisher):
                 self.logger.info("AMQP publisher is disabled")
             return
         
+        self._debug = self.logger.isEnabledFor(logging.DEBUG)
         try:
             host = self.config.get("host", "localhost")
             port = self.config.get("port", 5672)
@@ -886,33 +1530,150 @@ class AMQPPublisher(DataPublisher):
                 credentials=credentials
             )
             
-            self.connection = pika.BlockingConnection(parameters)
-            self.channel = self.connection.channel()
-            
-            # Declare exchange
-            exchange = self.config.get("exchange", "industrial.data")
-            exchange_type = self.config.get("exchange_type", "topic")
-            self.channel.exchange_declare(
-                exchange=exchange,
-                exchange_type=exchange_type,
-                durable=True
+            # Properties are identical for every message, build them once
+            self._properties = pika.BasicProperties(
+                delivery_mode=2 if self.config.get("persistent", True) else 1,
+                content_type=self._content_type
             )
+            self._exchange = self.config.get("exchange", "industrial.data")
+            self.routing_key_prefix = self.config.get("routing_key_prefix", "opcua")
+            self._routing_keys = {}
+            
+            # The IO loop owns the connection and channel; other threads hand
+            # work to it with add_callback_threadsafe
+            self._ready.clear()
+            self._closing = False
+            self.connection = pika.SelectConnection(
+                parameters,
+                on_open_callback=self._on_connection_open,
+                on_open_error_callback=self._on_connection_open_error,
+                on_close_callback=self._on_connection_closed
+            )
+            self.io_thread = threading.Thread(target=self.connection.ioloop.start, daemon=True)
+            self.io_thread.start()
+            
+            if not self._ready.wait(self.config.get("connect_timeout", 10)):
+                raise TimeoutError(f"could not open channel on {host}:{port}")
             
+            if self.batch_publish:
+                self._queue = self._create_publish_queue(self._flush_batch)
+                self._queue.start()
             self.running = True
-            self.logger.info(f"AMQP publisher started on {host}:{port}")
+            self.logger.info(f"AMQP publisher started on {host}:{port} (confirms: {self.confirm_mode})")
             
         except Exception as e:
             self.logger.error(f"Failed to start AMQP publisher: {e}")
+            self._shutdown_io_loop()
             self.running = False
     
+    def _on_connection_open(self, connection):
+        """IO loop callback: connection is up, open a channel."""
+        connection.channel(on_open_callback=self._on_channel_open)
+    
+    def _on_connection_open_error(self, connection, error):
+        """IO loop callback: connection could not be established."""
+        self.logger.error(f"AMQP connection failed: {error}")
+        connection.ioloop.stop()
+    
+    def _on_connection_closed(self, connection, reason):
+        """IO loop callback: connection closed, either by stop() or the broker."""
+        self.channel = None
+        self._ready.clear()
+        if not self._closing:
+            self.logger.warning(f"AMQP connection closed unexpectedly: {reason}")
+        connection.ioloop.stop()
+    
+    def _on_channel_open(self, channel):
+        """IO loop callback: channel is open, declare the exchange."""
+        self.channel = channel
+        channel.exchange_declare(
+            exchange=self._exchange,
+            exchange_type=self.config.get("exchange_type", "topic"),
+            durable=True,
+            callback=self._on_exchange_declared
+        )
+    
+    def _on_exchange_declared(self, frame):
+        """IO loop callback: exchange exists, enable confirms and go live."""
+        self._delivery_tag = 0
+        self._pending = {}
+        if self.confirm_mode == "async":
+            self.channel.confirm_delivery(ack_nack_callback=self._on_confirm)
+        self._ready.set()
+    
+    def _on_confirm(self, frame):
+        """
+        IO loop callback for Basic.Ack / Basic.Nack.
+        
+        With multiple=True the broker confirms every outstanding delivery tag up
+        to and including this one. Nacked messages are published again.
+        """
+        method = frame.method
+        nacked = isinstance(method, pika.spec.Basic.Nack)
+        if method.multiple:
+            # _pending is insertion-ordered, so tags come out ascending
+            confirmed = []
+            for tag in self._pending:
+                if tag > method.delivery_tag:
+                    break
+                confirmed.append(tag)
+        else:
+            confirmed = [method.delivery_tag]
+        
+        for tag in confirmed:
+            message = self._pending.pop(tag, None)
+            if nacked and message is not None:
+                self.logger.warning(f"AMQP broker nacked message for {message[0]}, republishing")
+                self._basic_publish(*message)
+    
+    def _basic_publish(self, routing_key: str, body: bytes):
+        """Publish on the channel. Must run on the IO loop thread."""
+        if self.channel is None or not self.channel.is_open:
+            return
+        self.channel.basic_publish(
+            exchange=self._exchange,
+            routing_key=routing_key,
+            body=body,
+            properties=self._properties
+        )
+        if self.confirm_mode == "async":
+            self._delivery_tag += 1
+            self._pending[self._delivery_tag] = (routing_key, body)
+    
+    def _close_connection(self):
+        """Close channel and connection. Must run on the IO loop thread."""
+        if self.channel is not None and self.channel.is_open:
+            self.channel.close()
+        if self.connection.is_open:
+            self.connection.close()
+        else:
+            self.connection.ioloop.stop()
+    
+    def _shutdown_io_loop(self):
+        """Ask the IO loop to close the connection and wait for it to exit."""
+        if not self.connection:
+            return
+        self._closing = True
+        try:
+            self.connection.ioloop.add_callback_threadsafe(self._close_connection)
+        except Exception:
+            pass
+        if self.io_thread:
+            self.io_thread.join(timeout=5)
+            self.io_thread = None
+    
     def stop(self):
         """Stop the AMQP publisher."""
         if self.connection and self.running:
             try:
-                self.channel.close()
-                self.connection.close()
+                if self._queue:
+                    self._queue.stop()
+                    self._queue = None
+                self._shutdown_io_loop()
             except:
                 pass
+            if self._pending:
+                self.logger.warning(f"AMQP publisher stopped with {len(self._pending)} unconfirmed messages")
             self.running = False
             self.logger.info("AMQP publisher stopped")
     
@@ -925,12 +1686,17 @@ class AMQPPublisher(DataPublisher):
             value: Tag value
             timestamp: Optional timestamp
         """
-        if not self.enabled or not self.running or not AMQP_AVAILABLE:
+        if not self.enabled or not self.running or not self._ready.is_set():
+            return
+        
+        if self._queue is not None:
+            self._queue.put((tag_name, value, timestamp))
             return
         
         try:
-            exchange = self.config.get("exchange", "industrial.data")
-            routing_key = self.config.get("routing_key_prefix", "opcua") + "." + tag_name
+            routing_key = self._routing_keys.get(tag_name)
+            if routing_key is None:
+                routing_key = self._routing_keys[tag_name] = f"{self.routing_key_prefix}.{tag_name}"
             
             # Create message payload
             message = {
@@ -939,20 +1705,43 @@ class AMQPPublisher(DataPublisher):
                 "timestamp": timestamp or time.time()
             }
             
-            self.channel.basic_publish(
-                exchange=exchange,
-                routing_key=routing_key,
-                body=json.dumps(message),
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # Make message persistent
-                    content_type='application/json'
-                )
+            # Hand off to the IO loop, never block on the broker here
+            self.connection.ioloop.add_callback_threadsafe(
+                functools.partial(self._basic_publish, routing_key, self._encode(message))
             )
             
-            self.logger.debug(f"Published to AMQP: {routing_key} = {value}")
+            if self._debug:
+                self.logger.debug("Published to AMQP: %s = %s", routing_key, value)
             
         except Exception as e:
             self.logger.error(f"Error publishing to AMQP: {e}")
+    
+    def _flush_batch(self, batch: list):
+        """Publish queued tag updates as one message routed to <prefix>._batch."""
+        routing_key = f"{self.routing_key_prefix}._batch"
+        self.connection.ioloop.add_callback_threadsafe(
+            functools.partial(self._basic_publish, routing_key, self._encode(_batch_frame(batch)))
+        )
+
+
+_WS_OPCODE_TEXT = 0x1
+_WS_OPCODE_BINARY = 0x2
+
+
+def _ws_header(length: int, opcode: int = _WS_OPCODE_TEXT) -> bytes:
+    """Header of an unmasked, unfragmented server-to-client WebSocket frame (RFC 6455)."""
+    if length <= 125:
+        return bytes((0x80 | opcode, length))
+    elif length <= 0xFFFF:
+        return struct.pack(">BBH", 0x80 | opcode, 126, length)
+    return struct.pack(">BBQ", 0x80 | opcode, 127, length)
+
+
+# A complete binary frame carrying one _BINARY_FRAME record, header included
+_ws_binary_record = functools.partial(
+    struct.Struct(">BB" + _BINARY_FRAME.format.lstrip(">")).pack,
+    0x80 | _WS_OPCODE_BINARY, _BINARY_FRAME.size
+)
 
 
 class WebSocketPublisher(DataPublisher):
@@ -967,17 +1756,39 @@ class WebSocketPublisher(DataPublisher):
             
         self.server = None
         self.server_thread = None
-        self.clients = []
+        self.clients = {}  # client id -> websocket_server client
+        # Guards mutation only; senders iterate over a snapshot
+        self._clients_lock = threading.Lock()
+        
+        # With broadcast_interval_ms > 0 updates are coalesced: only the latest
+        # value per tag is kept and sent as one snapshot frame per interval
+        self.broadcast_interval = config.get("broadcast_interval_ms", 0) / 1000.0
+        self._pending = {}
+        self._pending_cond = threading.Condition()
+        self._broadcast_thread = None
+        
+        # With batch_publish every update is sent, but queued ones go out
+        # together as one {"batch": [...]} frame per flush
+        self.batch_publish = config.get("batch_publish", False)
+        self._queue = None
+        
+        # payload_format "binary": numeric updates go out as binary frames
+        # holding one _BINARY_FRAME record, new ids are announced as JSON
+        self._binary = config.get("payload_format", "json") == "binary"
+        self._tag_ids = _TagIdMap()
         
     def new_client(self, client, server):
         """Called when a new client connects."""
-        self.clients.append(client)
+        with self._clients_lock:
+            self.clients[client['id']] = client
         self.logger.info(f"New WebSocket client connected: {client['id']}")
+        if self._binary and self._tag_ids.ids:
+            server.send_message(client, _json_dumps(self._tag_ids.announcement()))
     
     def client_left(self, client, server):
         """Called when a client disconnects."""
-        if client in self.clients:
-            self.clients.remove(client)
+        with self._clients_lock:
+            self.clients.pop(client['id'], None)
         self.logger.info(f"WebSocket client disconnected: {client['id']}")
     
     def start(self):
@@ -1004,6 +1815,13 @@ class WebSocketPublisher(DataPublisher):
             self.server_thread.start()
             self.running = True
             
+            if self.broadcast_interval > 0:
+                self._broadcast_thread = threading.Thread(target=self._broadcast_loop, daemon=True)
+                self._broadcast_thread.start()
+            elif self.batch_publish:
+                self._queue = self._create_publish_queue(self._flush_batch, batch_size=128)
+                self._queue.start()
+            
             self.logger.info(f"WebSocket server started on ws://{host}:{port}")
             
         except Exception as e:
@@ -1013,8 +1831,16 @@ class WebSocketPublisher(DataPublisher):
     def stop(self):
         """Stop the WebSocket server."""
         if self.server and self.running:
-            self.server.shutdown()
             self.running = False
+            if self._broadcast_thread:
+                with self._pending_cond:
+                    self._pending_cond.notify_all()
+                self._broadcast_thread.join(timeout=5)
+                self._broadcast_thread = None
+            if self._queue:
+                self._queue.stop()
+                self._queue = None
+            self.server.shutdown()
             self.logger.info("WebSocket publisher stopped")
     
     def publish(self, tag_name: str, value: Any, timestamp: Optional[float] = None):
@@ -1033,28 +1859,182 @@ class WebSocketPublisher(DataPublisher):
             if not self.clients:
                 return
             
-            # Create message payload
-            message = {
+            if self._broadcast_thread is not None:
+                cond = self._pending_cond
+                with cond:
+                    if not self._pending:
+                        cond.notify()
+                    self._pending[tag_name] = {"value": value, "timestamp": timestamp or time.time()}
+                return
+            
+            if self._queue is not None:
+                self._queue.put((tag_name, value, timestamp))
+                return
+            
+            if self._binary and type(value) in _BINARY_TYPES:
+                tid = self._tag_ids.ids.get(tag_name)
+                if tid is None:
+                    tid = self._tag_ids.assign(tag_name)
+                    if tid is not None:
+                        self._broadcast({"ids": {tag_name: tid}})
+                if tid is not None:
+                    ts_ns = int(timestamp * 1e9) if timestamp else time.time_ns()
+                    self._send_buffers((_ws_binary_record(tid, ts_ns, value),))
+                    return
+            
+            self._broadcast({
                 "tag": tag_name,
                 "value": value,
                 "timestamp": timestamp or time.time()
-            }
-            
-            message_json = json.dumps(message)
-            
-            # Broadcast to all connected clients
-            for client in self.clients[:]:  # Use copy to avoid modification during iteration
-                try:
-                    self.server.send_message(client, message_json)
-                except:
-                    # Remove disconnected clients
-                    if client in self.clients:
-                        self.clients.remove(client)
+            })
             
-            self.logger.debug(f"Broadcast to {len(self.clients)} WebSocket clients: {tag_name} = {value}")
+            if self._debug:
+                self.logger.debug("Broadcast to %d WebSocket clients: %s = %s", len(self.clients), tag_name, value)
             
         except Exception as e:
             self.logger.error(f"Error publishing to WebSocket: {e}")
+    
+    def _broadcast_loop(self):
+        """Send the coalesced tag snapshot at most once per broadcast interval."""
+        cond = self._pending_cond
+        while self.running:
+            with cond:
+                while self.running and not self._pending:
+                    cond.wait()
+                snapshot, self._pending = self._pending, {}
+            
+            if snapshot:
+                self._broadcast({"tags": snapshot})
+            time.sleep(self.broadcast_interval)
+    
+    def _flush_batch(self, batch: list):
+        """Send queued tag updates to all clients as a single batch frame."""
+        if not self.clients:
+            return
+        if not self._binary:
+            self._broadcast(_batch_frame(batch))
+            return
+        
+        # Numeric updates become back-to-back binary record frames, the rest
+        # one JSON batch frame; each client still gets a single write
+        records = []
+        rest = []
+        new_ids = {}
+        ids = self._tag_ids.ids
+        now_ns = time.time_ns()
+        for tag_name, value, timestamp in batch:
+            if type(value) in _BINARY_TYPES:
+                tid = ids.get(tag_name)
+                if tid is None:
+                    tid = self._tag_ids.assign(tag_name)
+                    if tid is not None:
+                        new_ids[tag_name] = tid
+                if tid is not None:
+                    records.append(_ws_binary_record(tid, int(timestamp * 1e9) if timestamp else now_ns, value))
+                    continue
+            rest.append((tag_name, value, timestamp))
+        
+        buffers = []
+        if new_ids:
+            buffers += self._text_frame({"ids": new_ids})
+        if records:
+            buffers.append(b"".join(records))
+        if rest:
+            buffers += self._text_frame(_batch_frame(rest))
+        self._send_buffers(buffers)
+    
+    @staticmethod
+    def _text_frame(message: Dict[str, Any]) -> List[bytes]:
+        """Serialize a message into the header and payload of one text frame."""
+        payload = _json_dumps(message)
+        return [_ws_header(len(payload)), payload]
+    
+    def _broadcast(self, message: Dict[str, Any]):
+        """Serialize and frame a message once and send it to every connected client."""
+        try:
+            # websocket_server would re-encode and re-frame the text per client
+            self._send_buffers(self._text_frame(message))
+        except Exception as e:
+            self.logger.error(f"Error broadcasting to WebSocket clients: {e}")
+    
+    def _send_buffers(self, buffers: List[bytes]):
+        """
+        Write already framed data to every connected client.
+        
+        The buffers go out with one scatter/gather sendmsg() per client, so
+        frame headers and payloads never have to be concatenated.
+        """
+        total = sum(map(len, buffers))
+        joined = None
+        dead = []
+        for client in tuple(self.clients.values()):
+            handler = client['handler']
+            sock = handler.request
+            try:
+                with handler._send_lock:
+                    try:
+                        sent = sock.sendmsg(buffers)
+                    except (AttributeError, NotImplementedError):
+                        # No sendmsg on this platform or socket type (TLS)
+                        sent = 0
+                    if sent < total:
+                        if joined is None:
+                            joined = memoryview(b"".join(buffers))
+                        sock.sendall(joined[sent:])
+            except OSError:
+                dead.append(client['id'])
+        
+        if dead:
+            # Stop sending to them now, their handler threads also call
+            # client_left() once they notice the dead socket
+            with self._clients_lock:
+                for client_id in dead:
+                    self.clients.pop(client_id, None)
+
+
+# MODBUS register packing, a 32-bit float spans two big-endian registers
+_MODBUS_F32 = struct.Struct('>f')
+_MODBUS_REGS2 = struct.Struct('>HH')
+# Strings take 32 registers, two chars each, padded with NULs
+_MODBUS_STR_REGS = struct.Struct('>32H')
+
+
+def _modbus_float_registers(value: Any) -> list:
+    # Convert float to 2 registers (32-bit IEEE 754)
+    return list(_MODBUS_REGS2.unpack(_MODBUS_F32.pack(float(value))))
+
+
+def _modbus_int_registers(value: Any) -> list:
+    # Convert int to 1 register (signed 16-bit), clamped to the 16-bit range
+    int_value = min(max(int(value), -32768), 32767)
+    # Convert to unsigned for register storage
+    return [int_value & 0xFFFF]
+
+
+def _modbus_bool_registers(value: Any) -> list:
+    # Convert bool to 1 register (0 or 1)
+    return [1 if value else 0]
+
+
+def _modbus_string_registers(value: Any) -> list:
+    # Convert string to registers (2 chars per register, max 64 chars)
+    raw = str(value)[:64].encode('latin-1', 'replace').ljust(64, b'\x00')
+    return list(_MODBUS_STR_REGS.unpack(raw))
+
+
+def _modbus_unknown_registers(value: Any) -> list:
+    return [0]
+
+
+_MODBUS_CONVERTERS = {
+    "float": _modbus_float_registers,
+    "int": _modbus_int_registers,
+    "bool": _modbus_bool_registers,
+    "string": _modbus_string_registers,
+}
+
+# Register type picked for auto-allocated tags, anything else is a float
+_MODBUS_TAG_TYPES = {bool: "bool", int: "int", float: "float", str: "string"}
 
 
 class ModbusTCPPublisher(DataPublisher):
@@ -1070,8 +2050,23 @@ class ModbusTCPPublisher(DataPublisher):
         self.server_thread = None
         self.context = None
         self.tag_register_map = {}  # Maps tag names to register addresses
-        self.register_tag_map = {}  # Maps register addresses to tag info
         self.next_register = 0
+        # tag name -> (start register, converter), filled on first publish
+        self._tag_info = {}
+        self._holding = None
+    
+    @property
+    def register_tag_map(self) -> Dict[int, Dict[str, Any]]:
+        """Reverse mapping of register address to tag info, built on demand."""
+        register_map = {}
+        for tag_name, info in self.tag_register_map.items():
+            for i in range(info["num_registers"]):
+                register_map[info["start_register"] + i] = {
+                    "tag_name": tag_name,
+                    "offset": i,
+                    "type": info["type"]
+                }
+        return register_map
         
     def allocate_registers(self, tag_name: str, tag_type: str) -> int:
         """
@@ -1106,16 +2101,9 @@ class ModbusTCPPublisher(DataPublisher):
             "type": tag_type
         }
         
-        # Create reverse mapping for reading
-        for i in range(num_registers):
-            self.register_tag_map[start_register + i] = {
-                "tag_name": tag_name,
-                "offset": i,
-                "type": tag_type
-            }
-        
         self.next_register += num_registers
-        self.logger.debug(f"Allocated registers {start_register}-{start_register + num_registers - 1} for {tag_name} ({tag_type})")
+        self._grow_holding_registers(self.next_register)
+        self.logger.debug("Allocated registers %d-%d for %s (%s)", start_register, start_register + num_registers - 1, tag_name, tag_type)
         
         return start_register
     
@@ -1147,12 +2135,15 @@ class ModbusTCPPublisher(DataPublisher):
                     }
                     self.next_register = max(self.next_register, start_reg + num_regs)
             
-            # Create MODBUS datastore (65536 registers, initialized to 0)
+            # Create MODBUS datastore sized to the mapped registers plus headroom,
+            # initialized to 0. Holding registers grow as tags get auto-allocated.
+            size = min(65536, max(1024, self.next_register + 1024))
+            self._holding = ModbusSequentialDataBlock(0, [0] * size)
             store = ModbusSlaveContext(
-                di=ModbusSequentialDataBlock(0, [0] * 65536),  # Discrete Inputs
-                co=ModbusSequentialDataBlock(0, [0] * 65536),  # Coils
-                hr=ModbusSequentialDataBlock(0, [0] * 65536),  # Holding Registers
-                ir=ModbusSequentialDataBlock(0, [0] * 65536)   # Input Registers
+                di=ModbusSequentialDataBlock(0, [0] * size),  # Discrete Inputs
+                co=ModbusSequentialDataBlock(0, [0] * size),  # Coils
+                hr=self._holding,                             # Holding Registers
+                ir=ModbusSequentialDataBlock(0, [0] * size)   # Input Registers
             )
             
             self.context = ModbusServerContext(slaves=store, single=True)
@@ -1205,42 +2196,7 @@ class ModbusTCPPublisher(DataPublisher):
         Returns:
             List of register values (16-bit integers)
         """
-        if tag_type == "float":
-            # Convert float to 2 registers (32-bit IEEE 754)
-            packed = struct.pack('>f', float(value))
-            reg1, reg2 = struct.unpack('>HH', packed)
-            return [reg1, reg2]
-        
-        elif tag_type == "int":
-            # Convert int to 1 register (signed 16-bit)
-            # Handle values outside 16-bit range
-            int_value = int(value)
-            if int_value > 32767:
-                int_value = 32767
-            elif int_value < -32768:
-                int_value = -32768
-            # Convert to unsigned for register storage
-            reg_value = int_value & 0xFFFF
-            return [reg_value]
-        
-        elif tag_type == "bool":
-            # Convert bool to 1 register (0 or 1)
-            return [1 if value else 0]
-        
-        elif tag_type == "string":
-            # Convert string to registers (2 chars per register)
-            str_value = str(value)[:64]  # Limit to 64 chars
-            registers = []
-            for i in range(0, len(str_value), 2):
-                char1 = ord(str_value[i]) if i < len(str_value) else 0
-                char2 = ord(str_value[i + 1]) if i + 1 < len(str_value) else 0
-                registers.append((char1 << 8) | char2)
-            # Pad to 32 registers
-            while len(registers) < 32:
-                registers.append(0)
-            return registers
-        
-        return [0]
+        return _MODBUS_CONVERTERS.get(tag_type, _modbus_unknown_registers)(value)
     
     def publish(self, tag_name: str, value: Any, timestamp: Optional[float] = None):
         """
@@ -1255,36 +2211,56 @@ class ModbusTCPPublisher(DataPublisher):
             return
         
         try:
-            # Get or allocate registers for this tag
-            if tag_name not in self.tag_register_map:
-                # Auto-allocate if not in mapping
-                tag_type = "float"  # Default to float
-                if isinstance(value, bool):
-                    tag_type = "bool"
-                elif isinstance(value, int):
-                    tag_type = "int"
-                elif isinstance(value, str):
-                    tag_type = "string"
-                
-                self.allocate_registers(tag_name, tag_type)
-            
-            tag_info = self.tag_register_map[tag_name]
-            start_register = tag_info["start_register"]
-            tag_type = tag_info["type"]
+            info = self._tag_info.get(tag_name)
+            if info is None:
+                info = self._resolve_tag(tag_name, value)
+            start_register, to_registers = info
             
             # Convert value to register values
-            register_values = self.value_to_registers(value, tag_type)
+            register_values = to_registers(value)
             
-            # Update holding registers in the datastore
-            slave_context = self.context[0]
-            for i, reg_value in enumerate(register_values):
-                slave_context.setValues(3, start_register + i, [reg_value])  # Function code 3 = holding registers
+            # Update holding registers in the datastore in one contiguous write
+            self.context[0].setValues(3, start_register, register_values)  # Function code 3 = holding registers
             
-            self.logger.debug(f"Updated MODBUS registers {start_register}-{start_register + len(register_values) - 1}: {tag_name} = {value}")
+            if self._debug:
+                self.logger.debug("Updated MODBUS registers %d-%d: %s = %s",
+                                  start_register, start_register + len(register_values) - 1, tag_name, value)
             
         except Exception as e:
             self.logger.error(f"Error publishing to MODBUS: {e}")
     
+    def _grow_holding_registers(self, end: int):
+        """Extend the holding register block so addresses below end exist."""
+        holding = self._holding
+        if holding is None or end <= len(holding.values):
+            return
+        size = min(65536, max(end, 2 * len(holding.values)))
+        holding.values.extend([0] * (size - len(holding.values)))
+    
+    def _resolve_tag(self, tag_name: str, value: Any) -> Tuple[int, Callable[[Any], list]]:
+        """Look up or auto-allocate a tag's registers and cache its converter."""
+        if tag_name not in self.tag_register_map:
+            # Auto-allocate if not in mapping
+            tag_type = _MODBUS_TAG_TYPES.get(type(value))
+            if tag_type is None:
+                if isinstance(value, bool):
+                    tag_type = "bool"
+                elif isinstance(value, int):
+                    tag_type = "int"
+                elif isinstance(value, str):
+                    tag_type = "string"
+                else:
+                    tag_type = "float"  # Default to float
+            
+            self.allocate_registers(tag_name, tag_type)
+        
+        tag_info = self.tag_register_map[tag_name]
+        info = self._tag_info[tag_name] = (
+            tag_info["start_register"],
+            _MODBUS_CONVERTERS.get(tag_info["type"], _modbus_unknown_registers)
+        )
+        return info
+    
     def get_register_map(self) -> Dict[str, Any]:
         """
         Get the current register mapping for documentation.
@@ -1295,6 +2271,60 @@ class ModbusTCPPublisher(DataPublisher):
         return self.tag_register_map.copy()
 
 
+_ALARM_COMPARATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+# Ordering conditions compare as floats, equality compares the raw values
+_NUMERIC_ALARM_CONDITIONS = frozenset((">", ">=", "<", "<="))
+
+
+@dataclass(frozen=True, slots=True)
+class AlarmEvent:
+    """Immutable alarm history entry, a snapshot taken at trigger or clear."""
+    
+    rule_name: str
+    tag: str
+    priority: str
+    message: str
+    condition: str
+    status: str
+    triggered_value: Any
+    triggered_at: float
+    last_value: Any
+    last_update: float
+    cleared_at: Optional[float] = None
+    cleared_value: Any = None
+    acknowledged: bool = False
+    acknowledged_by: Optional[str] = None
+    acknowledged_at: Optional[float] = None
+    
+    @classmethod
+    def from_alarm(cls, alarm: Dict[str, Any]) -> "AlarmEvent":
+        """Snapshot an active alarm record."""
+        return cls(
+            rule_name=alarm["rule_name"],
+            tag=alarm["tag"],
+            priority=alarm["priority"],
+            message=alarm["message"],
+            condition=alarm["condition"],
+            status=alarm["status"],
+            triggered_value=alarm["triggered_value"],
+            triggered_at=alarm["triggered_at"],
+            last_value=alarm["last_value"],
+            last_update=alarm["last_update"],
+            cleared_at=alarm["cleared_at"],
+            cleared_value=alarm.get("cleared_value"),
+            acknowledged=alarm.get("acknowledged", False),
+            acknowledged_by=alarm.get("acknowledged_by"),
+            acknowledged_at=alarm.get("acknowledged_at")
+        )
+
+
 class AlarmsPublisher(DataPublisher):
     """
     Alarms & Notifications Publisher - Because sometimes things go wrong
@@ -1354,10 +2384,26 @@ class AlarmsPublisher(DataPublisher):
         
         # Active alarms tracking
         self.active_alarms = {}  # tag_name -> alarm_info
-        self.alarm_history = deque(maxlen=self.history_size)
+        self.alarm_history = deque(maxlen=self.history_size)  # AlarmEvent entries
         
         # Last notification time per rule (for debouncing)
-        self.last_notification = {}  # rule_name -> timestamp
+        self.last_notification = {}  # rule key -> time.monotonic() of last notification
+        
+        # Kept-alive HTTP connections for webhook notifications, saves a TCP
+        # and TLS handshake per alarm
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+        
+        # Email/Slack/SMS sends run here so publish() never waits on them
+        self._notify_pool = None
+        
+        # SMTP settings resolved at start(), the connection is opened on first
+        # use and kept for later alarms (reopened if the server dropped it)
+        self._email_cfg = None
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
         
         # Parse rules
         self.parsed_rules = []
@@ -1374,6 +2420,13 @@ class AlarmsPublisher(DataPublisher):
                 "channels": rule.get("channels", ["log"])  # log, email, slack, sms
             })
         
+        # Rules grouped by tag so publish() only looks at the ones that apply,
+        # each with its condition compiled up front
+        self._rules_by_tag = {}
+        for rule in self.parsed_rules:
+            if self._compile_condition(rule):
+                self._rules_by_tag.setdefault(rule["tag"], []).append(rule)
+        
         self.logger.info(f"Alarms publisher initialized with {len(self.parsed_rules)} rules")
     
     def start(self):
@@ -1382,12 +2435,33 @@ class AlarmsPublisher(DataPublisher):
             self.logger.info("Alarms publisher is disabled")
             return
         
+        self._notify_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="alarm-notify")
+        
+        email_config = self.notifications_config.get("email", {})
+        if email_config.get("enabled", False) and email_config.get("to"):
+            self._email_cfg = {
+                "smtp_server": email_config.get("smtp_server", "localhost"),
+                "smtp_port": email_config.get("smtp_port", 587),
+                "username": email_config.get("username", ""),
+                "password": email_config.get("password", ""),
+                "from": email_config.get("from", "opcua@fireball.local"),
+                "to": ", ".join(email_config["to"])
+            }
+        else:
+            self._email_cfg = None
+        
         self.running = True
         self.logger.info(f"Alarms publisher started - monitoring {len(self.parsed_rules)} rules")
     
     def stop(self):
         """Stop the alarms publisher."""
         self.running = False
+        if self._notify_pool:
+            # Notifications already queued are still delivered
+            self._notify_pool.shutdown(wait=False)
+            self._notify_pool = None
+        with self._smtp_lock:
+            self._close_smtp()
         self.logger.info("Alarms publisher stopped")
     
     def publish(self, tag_name: str, value: Any, timestamp: Optional[float] = None):
@@ -1402,87 +2476,111 @@ class AlarmsPublisher(DataPublisher):
         if not self.enabled or not self.running:
             return
         
+        rules = self._rules_by_tag.get(tag_name)
+        if not rules:
+            return
+        now = timestamp or time.time()
+        
         # Check each rule that applies to this tag
-        for rule in self.parsed_rules:
-            if rule["tag"] != tag_name:
-                continue
-            
+        for rule in rules:
             # Evaluate condition
-            triggered = self._evaluate_condition(value, rule["condition"], rule["threshold"])
+            try:
+                if rule["_numeric"]:
+                    triggered = rule["_cmp"](float(value), rule["_threshold"])
+                else:
+                    triggered = rule["_cmp"](value, rule["_threshold"])
+            except (ValueError, TypeError) as e:
+                self.logger.error(f"Error evaluating condition: {e}")
+                triggered = False
             
-            rule_key = f"{rule['name']}_{tag_name}"
+            rule_key = rule["_key"]
             
             if triggered:
                 # Alarm condition met
-                if rule_key not in self.active_alarms:
+                alarm = self.active_alarms.get(rule_key)
+                if alarm is None:
                     # New alarm
-                    self._trigger_alarm(rule, tag_name, value, timestamp)
-                else:
-                    # Alarm already active, just update value
-                    self.active_alarms[rule_key]["last_value"] = value
-                    self.active_alarms[rule_key]["last_update"] = timestamp or time.time()
+                    self._trigger_alarm(rule, tag_name, rule_key, value, now)
+                elif alarm["last_value"] != value:
+                    # Alarm already active, just track value changes
+                    alarm["last_value"] = value
+                    alarm["last_update"] = now
             else:
                 # Alarm condition not met
                 if rule_key in self.active_alarms and rule["auto_clear"]:
                     # Clear alarm
-                    self._clear_alarm(rule, tag_name, value, timestamp)
+                    self._clear_alarm(rule, tag_name, rule_key, value, now)
     
-    def _evaluate_condition(self, value: Any, condition: str, threshold: Any) -> bool:
-        """Evaluate if value meets alarm condition."""
-        try:
-            if condition == ">":
-                return float(value) > float(threshold)
-            elif condition == ">=":
-                return float(value) >= float(threshold)
-            elif condition == "<":
-                return float(value) < float(threshold)
-            elif condition == "<=":
-                return float(value) <= float(threshold)
-            elif condition == "==":
-                return value == threshold
-            elif condition == "!=":
-                return value != threshold
-            else:
-                self.logger.warning(f"Unknown condition: {condition}")
-                return False
-        except (ValueError, TypeError) as e:
-            self.logger.error(f"Error evaluating condition: {e}")
+    def _compile_condition(self, rule: Dict) -> bool:
+        """
+        Resolve a rule's condition to a comparator and typed threshold.
+        
+        Stores the comparator, threshold, alarm key and alarm record template
+        on the rule.
+        
+        Returns:
+            False if the rule can never be evaluated (unknown condition or
+            non-numeric threshold for an ordering condition)
+        """
+        condition = rule["condition"]
+        cmp = _ALARM_COMPARATORS.get(condition)
+        if cmp is None:
+            self.logger.warning(f"Unknown condition: {condition} (rule '{rule['name']}' ignored)")
             return False
-    
-    def _trigger_alarm(self, rule: Dict, tag_name: str, value: Any, timestamp: Optional[float]):
-        """Trigger a new alarm."""
-        rule_key = f"{rule['name']}_{tag_name}"
-        now = timestamp or time.time()
         
-        # Check debounce
-        if rule_key in self.last_notification:
-            time_since_last = now - self.last_notification[rule_key]
-            if time_since_last < rule["debounce_seconds"]:
-                self.logger.debug(f"Alarm {rule_key} debounced ({time_since_last:.1f}s < {rule['debounce_seconds']}s)")
-                return
+        threshold = rule["threshold"]
+        numeric = condition in _NUMERIC_ALARM_CONDITIONS
+        if numeric:
+            try:
+                threshold = float(threshold)
+            except (ValueError, TypeError) as e:
+                self.logger.error(f"Invalid threshold for rule '{rule['name']}': {e}")
+                return False
         
-        # Create alarm record
-        alarm = {
+        rule["_cmp"] = cmp
+        rule["_numeric"] = numeric
+        rule["_threshold"] = threshold
+        # Rules are indexed by their own tag, so the alarm key and the constant
+        # part of the alarm record are fixed per rule
+        rule["_key"] = f"{rule['name']}_{rule['tag']}"
+        rule["_alarm_template"] = {
             "rule_name": rule["name"],
-            "tag": tag_name,
+            "tag": rule["tag"],
             "priority": rule["priority"],
             "message": rule["message"],
-            "condition": f"{rule['condition']} {rule['threshold']}",
-            "triggered_value": value,
-            "last_value": value,
-            "triggered_at": now,
-            "last_update": now,
+            "condition": f"{condition} {rule['threshold']}",
             "cleared_at": None,
             "status": "ACTIVE"
         }
+        return True
+    
+    def _trigger_alarm(self, rule: Dict, tag_name: str, rule_key: str, value: Any, now: float):
+        """Trigger a new alarm."""
+        # Check debounce, on the monotonic clock so wall clock jumps don't matter
+        mono = time.monotonic()
+        last = self.last_notification.get(rule_key)
+        if last is not None:
+            time_since_last = mono - last
+            if time_since_last < rule["debounce_seconds"]:
+                self.logger.debug("Alarm %s debounced (%.1fs < %ss)", rule_key, time_since_last, rule["debounce_seconds"])
+                return
+        
+        # Create alarm record
+        alarm = dict(
+            rule["_alarm_template"],
+            triggered_value=value,
+            last_value=value,
+            triggered_at=now,
+            last_update=now
+        )
         
         self.active_alarms[rule_key] = alarm
-        self.alarm_history.append(alarm.copy())
+        self.alarm_history.append(AlarmEvent.from_alarm(alarm))
         
         # Send notifications
         self._send_notifications(alarm, rule["channels"])
         
-        self.last_notification[rule_key] = now
+        self.last_notification[rule_key] = mono
         
         # Log
         priority_emoji = {"INFO": "ℹ️", "WARNING": "⚠️", "CRITICAL": "🚨"}
@@ -1491,10 +2589,8 @@ class AlarmsPublisher(DataPublisher):
             f"{emoji} ALARM TRIGGERED: {rule['name']} - {tag_name}={value} {rule['condition']} {rule['threshold']} - {rule['message']}"
         )
     
-    def _clear_alarm(self, rule: Dict, tag_name: str, value: Any, timestamp: Optional[float]):
+    def _clear_alarm(self, rule: Dict, tag_name: str, rule_key: str, value: Any, now: float):
         """Clear an active alarm."""
-        rule_key = f"{rule['name']}_{tag_name}"
-        now = timestamp or time.time()
         
         alarm = self.active_alarms[rule_key]
         alarm["status"] = "CLEARED"
@@ -1502,7 +2598,7 @@ class AlarmsPublisher(DataPublisher):
         alarm["cleared_value"] = value
         
         # Update history
-        self.alarm_history.append(alarm.copy())
+        self.alarm_history.append(AlarmEvent.from_alarm(alarm))
         
         # Remove from active
         del self.active_alarms[rule_key]
@@ -1519,39 +2615,35 @@ class AlarmsPublisher(DataPublisher):
             self._send_notifications(clear_alarm, rule["channels"])
     
     def _send_notifications(self, alarm: Dict, channels: list):
-        """Send alarm notifications to configured channels."""
+        """Queue alarm notifications for the configured channels on the notify pool."""
+        pool = self._notify_pool
+        if pool is None:
+            return
+        
+        # The senders run later, give them a copy the alarm updates can't change
+        alarm = alarm.copy()
         for channel in channels:
             if channel == "log":
                 # Already logged
                 pass
             elif channel == "email":
-                self._send_email(alarm)
+                pool.submit(self._send_email, alarm)
             elif channel == "slack":
-                self._send_slack(alarm)
+                pool.submit(self._send_slack, alarm)
             elif channel == "sms":
-                self._send_sms(alarm)
+                pool.submit(self._send_sms, alarm)
     
     def _send_email(self, alarm: Dict):
         """Send email notification."""
-        email_config = self.notifications_config.get("email", {})
-        if not email_config.get("enabled", False):
+        cfg = self._email_cfg
+        if cfg is None:
             return
         
         try:
-            smtp_server = email_config.get("smtp_server", "localhost")
-            smtp_port = email_config.get("smtp_port", 587)
-            username = email_config.get("username", "")
-            password = email_config.get("password", "")
-            from_addr = email_config.get("from", "opcua@fireball.local")
-            to_addrs = email_config.get("to", [])
-            
-            if not to_addrs:
-                return
-            
             # Create message
-            msg = MIMEMultipart()
-            msg["From"] = from_addr
-            msg["To"] = ", ".join(to_addrs)
+            msg = EmailMessage()
+            msg["From"] = cfg["from"]
+            msg["To"] = cfg["to"]
             msg["Subject"] = f"[{alarm['priority']}] {alarm['rule_name']} - {alarm['tag']}"
             
             body = f"""
@@ -1565,20 +2657,47 @@ class AlarmsPublisher(DataPublisher):
             Status: {alarm['status']}
             """
             
-            msg.attach(MIMEText(body, "plain"))
+            msg.set_content(body)
             
-            # Send
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                if username and password:
-                    server.starttls()
-                    server.login(username, password)
-                server.send_message(msg)
+            # Send, retrying once on a fresh connection if the kept one went stale
+            with self._smtp_lock:
+                for attempt in (1, 2):
+                    if self._smtp is None:
+                        self._smtp = self._connect_smtp(cfg)
+                    try:
+                        self._smtp.send_message(msg)
+                        break
+                    except (smtplib.SMTPServerDisconnected, ConnectionError):
+                        self._close_smtp()
+                        if attempt == 2:
+                            raise
             
             self.logger.info(f"Email notification sent for alarm: {alarm['rule_name']}")
             
         except Exception as e:
             self.logger.error(f"Error sending email notification: {e}")
     
+    def _connect_smtp(self, cfg: Dict[str, Any]) -> smtplib.SMTP:
+        """Open and authenticate an SMTP connection."""
+        server = smtplib.SMTP(cfg["smtp_server"], cfg["smtp_port"], timeout=30)
+        try:
+            if cfg["username"] and cfg["password"]:
+                server.starttls()
+                server.login(cfg["username"], cfg["password"])
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _close_smtp(self):
+        """Drop the kept SMTP connection, caller holds _smtp_lock."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                self._smtp.close()
+            self._smtp = None
+    
     def _send_slack(self, alarm: Dict):
         """Send Slack notification via webhook."""
         slack_config = self.notifications_config.get("slack", {})
@@ -1616,7 +2735,7 @@ class AlarmsPublisher(DataPublisher):
                 ]
             }
             
-            response = requests.post(webhook_url, json=payload, timeout=5)
+            response = self._http.post(webhook_url, json=payload, timeout=5)
             response.raise_for_status()
             
             self.logger.info(f"Slack notification sent for alarm: {alarm['rule_name']}")
@@ -1664,9 +2783,11 @@ class AlarmsPublisher(DataPublisher):
         return list(self.active_alarms.values())
     
     def get_alarm_history(self, limit: int = 100) -> list:
-        """Get alarm history."""
+        """Get alarm history as a list of dicts, oldest first."""
         history_list = list(self.alarm_history)
-        return history_list[-limit:] if limit else history_list
+        if limit:
+            history_list = history_list[-limit:]
+        return [asdict(event) for event in history_list]
     
     def acknowledge_alarm(self, rule_name: str, tag_name: str, user: str = "system"):
         """Acknowledge an active alarm (doesn't clear it, just marks as acknowledged)."""
@@ -1680,6 +2801,73 @@ class AlarmsPublisher(DataPublisher):
         return False
 
 
+# InfluxDB line protocol escaping, same rules as influxdb_client's Point
+_LP_ESCAPE_MEASUREMENT = str.maketrans({",": r"\,", " ": r"\ ", "\n": r"\n", "\t": r"\t", "\r": r"\r"})
+_LP_ESCAPE_KEY = str.maketrans({",": r"\,", "=": r"\=", " ": r"\ ", "\n": r"\n", "\t": r"\t", "\r": r"\r"})
+_LP_ESCAPE_STRING = str.maketrans({'"': r'\"', "\\": r"\\"})
+
+
+def _lp_float(value: float) -> str:
+    """Format a finite float for line protocol, whole numbers without '.0'."""
+    text = repr(value)
+    return text[:-2] if text.endswith(".0") else text
+
+
+def _lp_string(value: str) -> str:
+    return '"' + value.translate(_LP_ESCAPE_STRING) + '"'
+
+
+def _lp_value_float(value: float) -> Optional[str]:
+    if not math.isfinite(value):
+        return None
+    return "value=" + _lp_float(value)
+
+
+def _lp_value_int(value: int) -> str:
+    return "value=" + _lp_float(float(value))
+
+
+def _lp_value_bool(value: bool) -> str:
+    return "value=1" if value else "value=0"
+
+
+def _lp_value_str(value: str) -> str:
+    return "value=" + _lp_string(value)
+
+
+# Exact Python type -> (dtype tag, field formatter). Every numeric type is
+# written as one float "value" field so the field type never conflicts
+# between tags in the measurement
+_LP_FIELD_FORMATTERS = {
+    float: ("float", _lp_value_float),
+    int: ("int", _lp_value_int),
+    bool: ("bool", _lp_value_bool),
+    str: ("str", _lp_value_str),
+}
+
+
+def _lp_fields(value: Any) -> Tuple[str, Optional[str]]:
+    """
+    dtype tag and line protocol field set for a tag value.
+    
+    Returns:
+        (dtype, fields); fields is None when there is nothing writable (NaN/inf)
+    """
+    entry = _LP_FIELD_FORMATTERS.get(type(value))
+    if entry is None:
+        # Subclasses (IntEnum, numpy scalars, ...) by their closest base type
+        if isinstance(value, bool):
+            entry = _LP_FIELD_FORMATTERS[bool]
+        elif isinstance(value, int):
+            entry = _LP_FIELD_FORMATTERS[int]
+        elif isinstance(value, float):
+            entry = _LP_FIELD_FORMATTERS[float]
+        else:
+            return "str", _lp_value_str(str(value))
+    dtype, formatter = entry
+    return dtype, formatter(value)
+
+
 class InfluxDBPublisher(DataPublisher):
     """
     InfluxDB Publisher - Time-series database storage
@@ -1707,6 +2895,7 @@ class InfluxDBPublisher(DataPublisher):
             "org": "fireball-industries",
             "bucket": "industrial-data",
             "measurement": "opcua_tags",
+            "string_measurement": "opcua_tags_string",  // default: <measurement>_string
             "batch_size": 100,
             "flush_interval": 1000  // milliseconds
         }
@@ -1723,6 +2912,8 @@ class InfluxDBPublisher(DataPublisher):
         self.org = config.get("org", "fireball-industries")
         self.bucket = config.get("bucket", "industrial-data")
         self.measurement = config.get("measurement", "opcua_tags")
+        # String values have their own measurement so "value" is always a float
+        self.string_measurement = config.get("string_measurement", f"{self.measurement}_string")
         self.batch_size = config.get("batch_size", 100)
         self.flush_interval = config.get("flush_interval", 1000)
         
@@ -1732,6 +2923,9 @@ class InfluxDBPublisher(DataPublisher):
         # Additional tags to add to each point
         self.global_tags = config.get("tags", {})
         
+        # tag name -> (dtype, escaped "measurement,dtype=...,tag=...,<global tags>")
+        self._series_keys = {}
+        
     def start(self):
         """Start the InfluxDB publisher."""
         if not self.enabled or not INFLUXDB_AVAILABLE:
@@ -1749,9 +2943,16 @@ class InfluxDBPublisher(DataPublisher):
                 org=self.org
             )
             
-            # Create write API with batching
+            # Create write API with batching: points are buffered and sent as
+            # one line protocol request per batch_size points or flush_interval ms
             self.write_api = self.client.write_api(
-                write_options=SYNCHRONOUS
+                write_options=WriteOptions(
+                    batch_size=self.batch_size,
+                    flush_interval=self.flush_interval,
+                    jitter_interval=100,
+                    retry_interval=5000
+                ),
+                error_callback=self._on_write_error
             )
             
             # Test connection by pinging
@@ -1771,6 +2972,7 @@ class InfluxDBPublisher(DataPublisher):
         """Stop the InfluxDB publisher."""
         if self.write_api:
             try:
+                # Closing the batching writer flushes the points still buffered
                 self.write_api.close()
                 self.logger.debug("InfluxDB write API closed")
             except Exception as e:
@@ -1798,48 +3000,240 @@ class InfluxDBPublisher(DataPublisher):
             return
         
         try:
-            # Create point
-            point = Point(self.measurement)
-            
-            # Add tag name as a tag (for efficient querying)
-            point.tag("tag", tag_name)
-            
-            # Add global tags
-            for tag_key, tag_value in self.global_tags.items():
-                point.tag(tag_key, tag_value)
-            
-            # Add value as field (type-specific)
-            if isinstance(value, bool):
-                point.field("value_bool", value)
-                point.field("value", 1 if value else 0)  # Numeric representation
-            elif isinstance(value, int):
-                point.field("value_int", value)
-                point.field("value", float(value))
-            elif isinstance(value, float):
-                point.field("value_float", value)
-                point.field("value", value)
-            elif isinstance(value, str):
-                point.field("value_string", value)
-                # Try to parse as number for graphing
-                try:
-                    point.field("value", float(value))
-                except (ValueError, TypeError):
-                    pass
-            else:
-                point.field("value_string", str(value))
-            
-            # Set timestamp
-            if timestamp:
-                # Convert to nanoseconds (InfluxDB native precision)
-                point.time(int(timestamp * 1e9), WritePrecision.NS)
+            # Line protocol is formatted directly, the series key is built
+            # once per tag and the fields by a per-type formatter
+            dtype, fields = _lp_fields(value)
+            if fields is None:
+                return
             
-            # Write to InfluxDB
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            cached = self._series_keys.get(tag_name)
+            if cached is None or cached[0] != dtype:
+                # First value of the tag, or its type changed
+                cached = self._series_keys[tag_name] = (dtype, self._series_key(tag_name, dtype))
+            series = cached[1]
+            
+            # Nanoseconds (InfluxDB native precision). Always stamped here:
+            # the batching writer may send the point up to flush_interval later
+            ts_ns = int(timestamp * 1e9) if timestamp else time.time_ns()
+            
+            # Encoded up front; the writer batches bytes as they are
+            self.write_api.write(
+                bucket=self.bucket, org=self.org,
+                record=f"{series} {fields} {ts_ns}".encode(),
+                write_precision=WritePrecision.NS
+            )
             
-            self.logger.debug(f"Wrote to InfluxDB: {tag_name} = {value}")
+            if self._debug:
+                self.logger.debug("Wrote to InfluxDB: %s = %r", tag_name, value)
             
         except Exception as e:
             self.logger.error(f"Error writing to InfluxDB: {e}")
+    
+    def _on_write_error(self, conf: Tuple[str, str, str], data: Any, exception: Exception):
+        """Called by the batching writer when a batch fails after all retries."""
+        self.logger.error(f"InfluxDB batch write to {conf[0]} failed: {exception}")
+    
+    def _series_key(self, tag_name: str, dtype: str) -> str:
+        """Escaped measurement and sorted tag set for one tag's points of one dtype."""
+        tags = {"tag": tag_name, "dtype": dtype}
+        tags.update(self.global_tags)
+        measurement = self.string_measurement if dtype == "str" else self.measurement
+        parts = [measurement.translate(_LP_ESCAPE_MEASUREMENT)]
+        for key, value in sorted(tags.items()):
+            if key and value is not None and value != "":
+                parts.append(f"{key.translate(_LP_ESCAPE_KEY)}={str(value).translate(_LP_ESCAPE_KEY)}")
+        return ",".join(parts)
+
+
+_GRAPHQL_SCHEMA = None
+_EMPTY_METADATA = {}
+
+# Source object for TagType; metadata fields are only looked up when queried
+_GraphQLTag = namedtuple("_GraphQLTag", "name value timestamp metadata")
+
+
+def _get_graphql_schema() -> "graphene.Schema":
+    """
+    Shared GraphQL schema for all GraphQLPublisher instances.
+    
+    The schema does not depend on config, so it is built once. Resolvers find
+    the publisher to read from in info.context["publisher"].
+    """
+    global _GRAPHQL_SCHEMA
+    if _GRAPHQL_SCHEMA is not None:
+        return _GRAPHQL_SCHEMA
+    
+    # Define Tag type
+    class TagType(graphene.ObjectType):
+        name = graphene.String(description="Tag name")
+        value = graphene.Field(
+            graphene.String,
+            description="Tag value (can be string, float, int, or bool)"
+        )
+        type = graphene.String(description="Data type of the tag")
+        timestamp = graphene.Float(description="Last update timestamp")
+        description = graphene.String(description="Tag description")
+        units = graphene.String(description="Engineering units")
+        min_value = graphene.Float(description="Minimum value")
+        max_value = graphene.Float(description="Maximum value")
+        category = graphene.String(description="Tag category")
+        quality = graphene.String(description="Tag quality (good, bad, uncertain)")
+        writable = graphene.Boolean(description="Whether tag is writable")
+        simulation_type = graphene.String(description="Simulation type if simulated")
+        
+        def resolve_value(self, info):
+            # Return value as string for generic handling
+            return str(self.value) if self.value is not None else None
+        
+        def resolve_type(self, info):
+            return self.metadata.get('type', 'unknown')
+        
+        def resolve_description(self, info):
+            return self.metadata.get('description', '')
+        
+        def resolve_units(self, info):
+            return self.metadata.get('units', '')
+        
+        def resolve_min_value(self, info):
+            return self.metadata.get('min')
+        
+        def resolve_max_value(self, info):
+            return self.metadata.get('max')
+        
+        def resolve_category(self, info):
+            return self.metadata.get('category', 'general')
+        
+        def resolve_quality(self, info):
+            return self.metadata.get('quality', 'good')
+        
+        def resolve_writable(self, info):
+            return self.metadata.get('writable', False)
+        
+        def resolve_simulation_type(self, info):
+            return self.metadata.get('simulation_type')
+    
+    # Define Statistics type
+    class TagStatsType(graphene.ObjectType):
+        count = graphene.Int(description="Total number of tags")
+        tags = graphene.List(graphene.String, description="List of tag names")
+    
+    def build_tag(table, i, tag_metadata):
+        name = table.names[i]
+        value, timestamp = table.read(i)
+        return _GraphQLTag(name, value, timestamp, tag_metadata.get(name, _EMPTY_METADATA))
+    
+    # Define Query type
+    class Query(graphene.ObjectType):
+        # Get single tag
+        tag = graphene.Field(
+            TagType,
+            name=graphene.String(required=True, description="Tag name to query"),
+            description="Query a single tag by name"
+        )
+        
+        # Get all tags
+        tags = graphene.List(
+            TagType,
+            filter=graphene.String(description="Case-insensitive name substring, or a glob using * and ?"),
+            description="Query all tags, optionally filtered"
+        )
+        
+        # Get tag statistics
+        stats = graphene.Field(
+            TagStatsType,
+            description="Get statistics about available tags"
+        )
+        
+        def resolve_tag(self, info, name):
+            """Resolve single tag query."""
+            publisher = info.context["publisher"]
+            table = publisher.tag_cache
+            i = table.index(name)
+            if i is None:
+                return None
+            return build_tag(table, i, getattr(publisher, 'tag_metadata', _EMPTY_METADATA))
+        
+        def resolve_tags(self, info, filter=None):
+            """Resolve all tags query with optional filtering."""
+            publisher = info.context["publisher"]
+            table = publisher.tag_cache
+            metadata = getattr(publisher, 'tag_metadata', _EMPTY_METADATA)
+            # Slots are only ever appended, and the lowercased name of slot i
+            # is appended after the slot itself, so reading up to this length
+            # needs no lock
+            lower_names = publisher._lower_names
+            count = len(lower_names)
+            if not filter:
+                return [build_tag(table, i, metadata) for i in range(count)]
+            # Exact tag name, the common case for dashboards
+            i = table.index(filter)
+            if i is not None:
+                return [build_tag(table, i, metadata)]
+            if "*" in filter or "?" in filter:
+                match = _glob_matcher(filter)
+                names = table.names
+                return [build_tag(table, i, metadata) for i in range(count) if match(names[i])]
+            pattern = filter.lower()
+            return [build_tag(table, i, metadata) for i in range(count) if pattern in lower_names[i]]
+        
+        def resolve_stats(self, info):
+            """Resolve stats query."""
+            table = info.context["publisher"].tag_cache
+            return TagStatsType(
+                count=len(table),
+                tags=table.names[:]
+            )
+    
+    _GRAPHQL_SCHEMA = graphene.Schema(query=Query)
+    return _GRAPHQL_SCHEMA
+
+
+@functools.lru_cache(maxsize=128)
+def _glob_matcher(pattern: str) -> Callable[[str], Any]:
+    """Case-insensitive matcher for a tag name glob ("Tank?_*"), compiled once per pattern."""
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE).match
+
+
+@functools.lru_cache(maxsize=256)
+def _prepare_graphql_query(query: str) -> Tuple[Any, Tuple["GraphQLError", ...]]:
+    """
+    Parse and validate a query against the shared schema, cached by query text.
+    
+    Dashboards send the same few queries over and over, so only the first
+    request for each pays for parsing and validation.
+    
+    Returns:
+        (document, errors): document is None when errors is non-empty
+    """
+    try:
+        document = parse(query)
+    except GraphQLError as e:
+        return None, (e,)
+    errors = validate(_get_graphql_schema().graphql_schema, document)
+    if errors:
+        return None, tuple(errors)
+    return document, ()
+
+
+_GRAPHIQL_HTML = """<!DOCTYPE html>
+<html>
+<head>
+  <title>GraphiQL</title>
+  <link rel="stylesheet" href="https://unpkg.com/graphiql@3/graphiql.min.css" />
+</head>
+<body style="margin: 0">
+  <div id="graphiql" style="height: 100vh"></div>
+  <script crossorigin src="https://unpkg.com/react@18/umd/react.production.min.js"></script>
+  <script crossorigin src="https://unpkg.com/react-dom@18/umd/react-dom.production.min.js"></script>
+  <script crossorigin src="https://unpkg.com/graphiql@3/graphiql.min.js"></script>
+  <script>
+    const fetcher = GraphiQL.createFetcher({ url: window.location.pathname });
+    ReactDOM.createRoot(document.getElementById("graphiql"))
+      .render(React.createElement(GraphiQL, { fetcher: fetcher }));
+  </script>
+</body>
+</html>
+"""
 
 
 class GraphQLPublisher(DataPublisher):
@@ -1867,155 +3261,83 @@ class GraphQLPublisher(DataPublisher):
             "host": "0.0.0.0",
             "port": 5002,
             "graphiql": true,  // Enable GraphiQL web interface
-            "cors_enabled": true
+            "cors_enabled": true,
+            "threads": 8  // HTTP worker threads (waitress)
         }
         """
         super().__init__(config, logger)
+        self._close_server = None
         
         if not GRAPHQL_AVAILABLE:
-            self.logger.warning("GraphQL libraries not available. Install with: pip install graphene flask-graphql")
+            self.logger.warning("GraphQL libraries not available. Install with: pip install graphene")
             self.enabled = False
             return
         
         self.app = Flask(__name__)
+        if ORJSON_AVAILABLE:
+            self.app.json = ORJSONProvider(self.app)
+        # GraphQL responses keep the field order of the query
+        self.app.json.sort_keys = False
         if config.get("cors_enabled", True):
             CORS(self.app)
         
-        self.tags_data = {}  # In-memory tag storage
+        # Latest value per tag, plus its lowercased name per slot for filtering
+        self.tag_cache = _TagTable()
+        self._lower_names = []
         self.server_thread = None
         
-        # Build GraphQL schema
-        self._setup_schema()
+        self.schema = _get_graphql_schema()
         
         # Add GraphQL endpoint
         host = config.get("host", "0.0.0.0")
         port = config.get("port", 5002)
         graphiql = config.get("graphiql", True)
         
-        self.app.add_url_rule(
-            '/graphql',
-            view_func=GraphQLView.as_view(
-                'graphql',
-                schema=self.schema,
-                graphiql=graphiql  # Enable GraphiQL IDE
-            )
-        )
+        self._graphiql = graphiql
+        self.app.add_url_rule('/graphql', 'graphql', self._handle_graphql, methods=['GET', 'POST'])
         
         self.logger.info(f"GraphQL publisher initialized on http://{host}:{port}/graphql")
         if graphiql:
             self.logger.info(f"GraphiQL IDE available at http://{host}:{port}/graphql")
     
-    def _setup_schema(self):
-        """Setup GraphQL schema with types and queries."""
-        
-        # Define Tag type
-        class TagType(graphene.ObjectType):
-            name = graphene.String(description="Tag name")
-            value = graphene.Field(
-                graphene.String,
-                description="Tag value (can be string, float, int, or bool)"
-            )
-            type = graphene.String(description="Data type of the tag")
-            timestamp = graphene.Float(description="Last update timestamp")
-            description = graphene.String(description="Tag description")
-            units = graphene.String(description="Engineering units")
-            min_value = graphene.Float(description="Minimum value")
-            max_value = graphene.Float(description="Maximum value")
-            category = graphene.String(description="Tag category")
-            quality = graphene.String(description="Tag quality (good, bad, uncertain)")
-            writable = graphene.Boolean(description="Whether tag is writable")
-            simulation_type = graphene.String(description="Simulation type if simulated")
-            
-            def resolve_value(self, info):
-                # Return value as string for generic handling
-                return str(self.value) if self.value is not None else None
-        
-        # Define Statistics type
-        class TagStatsType(graphene.ObjectType):
-            count = graphene.Int(description="Total number of tags")
-            tags = graphene.List(graphene.String, description="List of tag names")
-        
-        # Define Query type
-        class Query(graphene.ObjectType):
-            # Get single tag
-            tag = graphene.Field(
-                TagType,
-                name=graphene.String(required=True, description="Tag name to query"),
-                description="Query a single tag by name"
-            )
-            
-            # Get all tags
-            tags = graphene.List(
-                TagType,
-                filter=graphene.String(description="Filter tags by name pattern"),
-                description="Query all tags, optionally filtered"
-            )
-            
-            # Get tag statistics
-            stats = graphene.Field(
-                TagStatsType,
-                description="Get statistics about available tags"
-            )
-            
-            def resolve_tag(self, info, name):
-                """Resolve single tag query."""
-                if name in self.tags_data:
-                    tag_data = self.tags_data[name]
-                    metadata = self.tag_metadata.get(name, {})
-                    return TagType(
-                        name=name,
-                        value=tag_data.get('value'),
-                        type=metadata.get('type', 'unknown'),
-                        timestamp=tag_data.get('timestamp'),
-                        description=metadata.get('description', ''),
-                        units=metadata.get('units', ''),
-                        min_value=metadata.get('min'),
-                        max_value=metadata.get('max'),
-                        category=metadata.get('category', 'general'),
-                        quality=metadata.get('quality', 'good'),
-                        writable=metadata.get('writable', False),
-                        simulation_type=metadata.get('simulation_type')
-                    )
-                return None
-            
-            def resolve_tags(self, info, filter=None):
-                """Resolve all tags query with optional filtering."""
-                tags = []
-                for name, tag_data in self.tags_data.items():
-                    # Apply filter if provided
-                    if filter and filter.lower() not in name.lower():
-                        continue
-                    
-                    metadata = self.tag_metadata.get(name, {})
-                    tags.append(TagType(
-                        name=name,
-                        value=tag_data.get('value'),
-                        type=metadata.get('type', 'unknown'),
-                        timestamp=tag_data.get('timestamp'),
-                        description=metadata.get('description', ''),
-                        units=metadata.get('units', ''),
-                        min_value=metadata.get('min'),
-                        max_value=metadata.get('max'),
-                        category=metadata.get('category', 'general'),
-                        quality=metadata.get('quality', 'good'),
-                        writable=metadata.get('writable', False),
-                        simulation_type=metadata.get('simulation_type')
-                    ))
-                return tags
-            
-            def resolve_stats(self, info):
-                """Resolve stats query."""
-                return TagStatsType(
-                    count=len(self.tags_data),
-                    tags=list(self.tags_data.keys())
-                )
-        
-        # Bind tags_data and metadata to Query class for resolvers
-        Query.tags_data = self.tags_data
-        Query.tag_metadata = getattr(self, 'tag_metadata', {})
-        
-        # Create schema
-        self.schema = graphene.Schema(query=Query)
+    def _handle_graphql(self):
+        """Execute a GraphQL request (GET or POST), or serve GraphiQL to browsers."""
+        if request.method == 'POST':
+            if request.mimetype == 'application/graphql':
+                params = {"query": request.get_data(as_text=True)}
+            else:
+                params = request.get_json(silent=True) or request.form
+        else:
+            params = request.args
+            if (self._graphiql and "query" not in params
+                    and request.accept_mimetypes.accept_html):
+                return Response(_GRAPHIQL_HTML, mimetype='text/html')
+        
+        query = params.get("query")
+        if not query:
+            return jsonify({"errors": [{"message": "Must provide query string."}]}), 400
+        variables = params.get("variables")
+        if isinstance(variables, str):
+            try:
+                variables = json.loads(variables) if variables else None
+            except ValueError:
+                return jsonify({"errors": [{"message": "Variables are invalid JSON."}]}), 400
+        
+        document, errors = _prepare_graphql_query(query)
+        if errors:
+            return jsonify({"errors": [error.formatted for error in errors]}), 400
+        
+        result = execute(
+            self.schema.graphql_schema,
+            document,
+            context_value={"publisher": self},
+            variable_values=variables,
+            operation_name=params.get("operationName")
+        )
+        response = {"data": result.data}
+        if result.errors:
+            response["errors"] = [error.formatted for error in result.errors]
+        return jsonify(response)
     
     def start(self):
         """Start the GraphQL API server."""
@@ -2030,21 +3352,29 @@ class GraphQLPublisher(DataPublisher):
             host = self.config.get("host", "0.0.0.0")
             port = self.config.get("port", 5002)
             
-            def run_server():
-                self.app.run(host=host, port=port, debug=False, use_reloader=False)
+            # Bind here so port errors surface from start() rather than the thread
+            run_server, self._close_server = _make_wsgi_server(
+                self.app, host, port, self.config.get("threads", 8)
+            )
             
             self.server_thread = threading.Thread(target=run_server, daemon=True)
             self.server_thread.start()
+            self.running = True
             
-            self.logger.info(f"GraphQL API server started on http://{host}:{port}/graphql")
+            self.logger.info(f"GraphQL API server started on http://{host}:{port}/graphql ({'waitress' if WAITRESS_AVAILABLE else 'werkzeug'})")
             
         except Exception as e:
             self.logger.error(f"Failed to start GraphQL publisher: {e}")
     
     def stop(self):
         """Stop the GraphQL API server."""
-        # Flask doesn't have a graceful shutdown in this mode
-        # The daemon thread will stop when the main process stops
+        if self._close_server:
+            try:
+                self._close_server()
+            except Exception as e:
+                self.logger.warning(f"Error closing GraphQL server: {e}")
+            self._close_server = None
+        self.running = False
         self.logger.info("GraphQL publisher stopped")
     
     def publish(self, tag_name: str, value: Any, timestamp: Optional[float] = None):
@@ -2059,15 +3389,38 @@ class GraphQLPublisher(DataPublisher):
         if not self.enabled or not GRAPHQL_AVAILABLE:
             return
         
-        # Determine type
-        value_type = type(value).__name__
-        
-        # Store tag data
-        self.tags_data[tag_name] = {
-            "value": value,
-            "type": value_type,
-            "timestamp": timestamp or time.time()
-        }
+        table = self.tag_cache
+        is_new = tag_name not in table
+        table.set(tag_name, value, timestamp or time.time())
+        if is_new:
+            self._lower_names.append(tag_name.lower())
+
+
+if OPCUA_CLIENT_AVAILABLE:
+    # Exact Python type -> variant type for values written to remote servers
+    _OPCUA_VARIANT_TYPES = {
+        bool: ua.VariantType.Boolean,
+        int: ua.VariantType.Int32,
+        float: ua.VariantType.Double,
+        str: ua.VariantType.String,
+    }
+
+
+def _opcua_data_value(value: Any) -> "ua.DataValue":
+    """Wrap a tag value in an OPC UA DataValue; unknown types are written as strings."""
+    variant_type = _OPCUA_VARIANT_TYPES.get(type(value))
+    if variant_type is None:
+        # Subclasses (IntEnum, numpy scalars, ...) by their closest base type
+        if isinstance(value, bool):
+            variant_type = ua.VariantType.Boolean
+        elif isinstance(value, int):
+            variant_type = ua.VariantType.Int32
+        elif isinstance(value, float):
+            variant_type = ua.VariantType.Double
+        else:
+            value = str(value)
+            variant_type = ua.VariantType.String
+    return ua.DataValue(ua.Variant(value, variant_type))
 
 
 class OPCUAClientPublisher(DataPublisher):
@@ -2112,7 +3465,9 @@ class OPCUAClientPublisher(DataPublisher):
                     }
                 }
             ],
-            "reconnect_interval": 5  # Seconds between reconnection attempts
+            "reconnect_interval": 5,  # Seconds before the first reconnection attempt
+            "reconnect_max_interval": 60,  # Backoff cap, doubling from reconnect_interval
+            "batch_publish": false  # Queue updates and write them in one request per server
         }
         """
         super().__init__(config, logger)
@@ -2124,11 +3479,19 @@ class OPCUAClientPublisher(DataPublisher):
         
         self.servers_config = config.get("servers", [])
         self.reconnect_interval = config.get("reconnect_interval", 5)
+        self.reconnect_max_interval = config.get("reconnect_max_interval", 60)
         
         # Track client connections
         self.clients = {}  # server_name -> {"client": OPCUAClient, "connected": bool, "nodes": {}}
         self.running = False
         self.reconnect_thread = None
+        # Wakes the reconnect thread early, e.g. when a write fails
+        self._reconnect_event = threading.Event()
+        # Whether any server is connected; lets publish() return at once
+        # while every server is down
+        self._any_connected = False
+        self.batch_publish = config.get("batch_publish", False)
+        self._queue = None
         
         self.logger.info(f"OPC UA Client publisher initialized with {len(self.servers_config)} server(s)")
     
@@ -2147,6 +3510,10 @@ class OPCUAClientPublisher(DataPublisher):
         self.reconnect_thread = threading.Thread(target=self._reconnect_loop, daemon=True)
         self.reconnect_thread.start()
         
+        if self.batch_publish:
+            self._queue = self._create_publish_queue(self._flush_batch, batch_size=500)
+            self._queue.start()
+        
         self.logger.info("OPC UA Client publisher started")
     
     def stop(self):
@@ -2155,6 +3522,10 @@ class OPCUAClientPublisher(DataPublisher):
             return
         
         self.running = False
+        self._reconnect_event.set()
+        if self._queue:
+            self._queue.stop()
+            self._queue = None
         
         # Disconnect all clients
         for server_name, client_info in self.clients.items():
@@ -2166,6 +3537,7 @@ class OPCUAClientPublisher(DataPublisher):
                 self.logger.error(f"Error disconnecting from {server_name}: {e}")
         
         self.clients.clear()
+        self._any_connected = False
         self.logger.info("OPC UA Client publisher stopped")
     
     def _connect_to_server(self, server_config: Dict[str, Any]):
@@ -2178,6 +3550,14 @@ class OPCUAClientPublisher(DataPublisher):
         server_name = server_config.get("name", server_config["url"])
         url = server_config["url"]
         
+        # Drop the session a failed write left behind before opening a new one
+        old_client = self.clients.get(server_name, {}).get("client")
+        if old_client is not None:
+            try:
+                old_client.disconnect()
+            except Exception:
+                pass
+        
         try:
             client = OPCUAClient(url)
             
@@ -2195,30 +3575,62 @@ class OPCUAClientPublisher(DataPublisher):
                 "connected": True,
                 "config": server_config,
                 "nodes": {},  # tag_name -> node object cache
-                "root": client.get_root_node(),
-                "objects": client.get_objects_node()
+                "missing": set(),  # tags with no node and auto_create_nodes off
+                # Node id of a tag is this prefix + tag name: base_node, or
+                # a string id in the configured namespace
+                "node_id_prefix": server_config.get("base_node") or f"ns={server_config.get('namespace', 2)};s=",
+                "node_mapping": server_config.get("node_mapping") or {},
+                "auto_create_nodes": server_config.get("auto_create_nodes", False)
             }
             
+            self._any_connected = True
             self.logger.info(f"Connected to OPC UA server: {server_name} ({url})")
             
         except Exception as e:
-            self.logger.error(f"Failed to connect to {server_name}: {e}")
+            # Exponential backoff with jitter so servers that are down aren't
+            # hammered and several gateways don't retry in lockstep
+            attempts = self.clients.get(server_name, {}).get("attempts", 0) + 1
+            delay = min(self.reconnect_max_interval, self.reconnect_interval * 2 ** min(attempts - 1, 16))
+            self.logger.error(f"Failed to connect to {server_name}: {e} (retrying in {delay:g}s)")
             self.clients[server_name] = {
                 "client": None,
                 "connected": False,
                 "config": server_config,
-                "nodes": {}
+                "nodes": {},
+                "missing": set(),
+                "attempts": attempts,
+                "retry_at": time.monotonic() + delay + random.uniform(0, 0.5)
             }
     
     def _reconnect_loop(self):
         """Background thread to reconnect to disconnected servers."""
         while self.running:
-            time.sleep(self.reconnect_interval)
+            self._reconnect_event.clear()
             
+            # Retry servers that are due, and sleep until the next one is;
+            # with every server connected, sleep until a write fails
+            next_retry = None
             for server_name, client_info in list(self.clients.items()):
-                if not client_info["connected"]:
+                if client_info["connected"]:
+                    continue
+                retry_at = client_info.get("retry_at", 0.0)
+                if retry_at <= time.monotonic():
                     self.logger.info(f"Attempting to reconnect to {server_name}...")
                     self._connect_to_server(client_info["config"])
+                    client_info = self.clients.get(server_name)
+                    if not client_info or client_info["connected"]:
+                        continue
+                    retry_at = client_info["retry_at"]
+                if next_retry is None or retry_at < next_retry:
+                    next_retry = retry_at
+            
+            self._update_any_connected()
+            
+            timeout = None if next_retry is None else max(0.0, next_retry - time.monotonic())
+            self._reconnect_event.wait(timeout)
+    
+    def _update_any_connected(self):
+        self._any_connected = any(info["connected"] for info in list(self.clients.values()))
     
     def _get_or_create_node(self, client_info: Dict[str, Any], tag_name: str):
         """
@@ -2232,16 +3644,15 @@ class OPCUAClientPublisher(DataPublisher):
             Node object or None
         """
         # Check cache first
-        if tag_name in client_info["nodes"]:
-            return client_info["nodes"][tag_name]
+        node = client_info["nodes"].get(tag_name)
+        if node is not None or tag_name in client_info["missing"]:
+            return node
         
-        config = client_info["config"]
         client = client_info["client"]
         
         # Check for explicit node mapping
-        node_mapping = config.get("node_mapping", {})
-        if tag_name in node_mapping:
-            node_id = node_mapping[tag_name]
+        node_id = client_info["node_mapping"].get(tag_name)
+        if node_id is not None:
             try:
                 node = client.get_node(node_id)
                 client_info["nodes"][tag_name] = node
@@ -2250,42 +3661,40 @@ class OPCUAClientPublisher(DataPublisher):
                 self.logger.error(f"Failed to get mapped node {node_id}: {e}")
                 return None
         
-        # Build node path from base_node + tag_name
-        base_node = config.get("base_node", "")
-        if base_node:
-            node_id = f"{base_node}{tag_name}"
-        else:
-            namespace = config.get("namespace", 2)
-            node_id = f"ns={namespace};s={tag_name}"
+        node_id = client_info["node_id_prefix"] + tag_name
+        
+        create_error = None
+        if client_info["auto_create_nodes"]:
+            # Try creating first so the usual case costs one request, not a
+            # failed lookup plus a create
+            try:
+                # Objects folder node is only needed here; looked up on first use
+                objects = client_info.get("objects")
+                if objects is None:
+                    objects = client_info["objects"] = client.get_objects_node()
+                node = objects.add_variable(node_id, tag_name, 0.0)
+                node.set_writable()
+                client_info["nodes"][tag_name] = node
+                self.logger.info(f"Created new node: {node_id}")
+                return node
+            except Exception as e:
+                # Already exists, or the server doesn't allow adding nodes
+                create_error = e
         
         try:
-            # Try to get existing node
+            # Verify the node exists by reading its browse name (throws if it doesn't)
             node = client.get_node(node_id)
-            # Verify it exists by reading a value (will throw if doesn't exist)
-            _ = node.get_browse_name()
-            client_info["nodes"][tag_name] = node
-            return node
+            node.get_browse_name()
         except Exception:
-            # Node doesn't exist
-            if config.get("auto_create_nodes", False):
-                try:
-                    # Create a new variable node
-                    objects = client_info["objects"]
-                    namespace = config.get("namespace", 2)
-                    
-                    # Create the variable
-                    node = objects.add_variable(namespace, tag_name, 0.0)
-                    node.set_writable()
-                    
-                    client_info["nodes"][tag_name] = node
-                    self.logger.info(f"Created new node: {node_id}")
-                    return node
-                except Exception as e:
-                    self.logger.error(f"Failed to create node {node_id}: {e}")
-                    return None
+            # Remembered until the next reconnect so the lookup and log aren't repeated
+            client_info["missing"].add(tag_name)
+            if create_error is not None:
+                self.logger.error(f"Failed to create node {node_id}: {create_error}")
             else:
                 self.logger.warning(f"Node {node_id} not found and auto_create_nodes is disabled")
-                return None
+            return None
+        client_info["nodes"][tag_name] = node
+        return node
     
     def publish(self, tag_name: str, value: Any, timestamp: Optional[float] = None):
         """
@@ -2296,9 +3705,16 @@ class OPCUAClientPublisher(DataPublisher):
             value: Tag value
             timestamp: Optional timestamp (currently not used)
         """
-        if not self.enabled:
+        if not self.enabled or not self._any_connected:
             return
         
+        if self._queue is not None:
+            self._queue.put((tag_name, value))
+            return
+        
+        # Same DataValue for every server
+        ua_value = None
+        
         for server_name, client_info in self.clients.items():
             if not client_info["connected"]:
                 continue
@@ -2309,26 +3725,52 @@ class OPCUAClientPublisher(DataPublisher):
                 if not node:
                     continue
                 
-                # Convert Python types to OPC UA DataValue
-                if isinstance(value, bool):
-                    ua_value = ua.DataValue(ua.Variant(value, ua.VariantType.Boolean))
-                elif isinstance(value, int):
-                    ua_value = ua.DataValue(ua.Variant(value, ua.VariantType.Int32))
-                elif isinstance(value, float):
-                    ua_value = ua.DataValue(ua.Variant(value, ua.VariantType.Double))
-                elif isinstance(value, str):
-                    ua_value = ua.DataValue(ua.Variant(value, ua.VariantType.String))
-                else:
-                    ua_value = ua.DataValue(ua.Variant(str(value), ua.VariantType.String))
+                if ua_value is None:
+                    ua_value = _opcua_data_value(value)
                 
                 # Write the value
                 node.set_value(ua_value)
-                self.logger.debug(f"Wrote {tag_name}={value} to {server_name}")
+                if self._debug:
+                    self.logger.debug("Wrote %s=%r to %s", tag_name, value, server_name)
                 
             except Exception as e:
                 self.logger.error(f"Error writing {tag_name} to {server_name}: {e}")
                 # Mark as disconnected on error
                 client_info["connected"] = False
+                self._update_any_connected()
+                self._reconnect_event.set()
+    
+    def _flush_batch(self, batch: list):
+        """Write queued (tag, value) updates with one write request per server."""
+        # Only the newest queued value of each tag is written
+        data_values = {tag_name: _opcua_data_value(value) for tag_name, value in dict(batch).items()}
+        
+        for server_name, client_info in list(self.clients.items()):
+            if not client_info["connected"]:
+                continue
+            
+            try:
+                nodes = []
+                values = []
+                for tag_name, ua_value in data_values.items():
+                    node = self._get_or_create_node(client_info, tag_name)
+                    if node:
+                        nodes.append(node)
+                        values.append(ua_value)
+                
+                if len(nodes) == 1:
+                    nodes[0].set_value(values[0])
+                elif nodes:
+                    client_info["client"].set_values(nodes, values)
+                if self._debug:
+                    self.logger.debug("Wrote %d tags to %s", len(nodes), server_name)
+                
+            except Exception as e:
+                self.logger.error(f"Error writing {len(data_values)} tags to {server_name}: {e}")
+                # Mark as disconnected on error
+                client_info["connected"] = False
+                self._update_any_connected()
+                self._reconnect_event.set()
 
 
 class PrometheusPublisher(DataPublisher):
@@ -2739,7 +4181,7 @@ class SQLitePersistencePublisher(DataPublisher):
                     self.write_buffer
                 )
                 self.connection.commit()
-                self.logger.debug(f"Flushed {len(self.write_buffer)} tag history records")
+                self.logger.debug("Flushed %d tag history records", len(self.write_buffer))
                 self.write_buffer.clear()
         except Exception as e:
             self.logger.error(f"Error flushing tag history: {e}")
@@ -2757,7 +4199,7 @@ class SQLitePersistencePublisher(DataPublisher):
                     self.audit_buffer
                 )
                 self.connection.commit()
-                self.logger.debug(f"Flushed {len(self.audit_buffer)} audit log records")
+                self.logger.debug("Flushed %d audit log records", len(self.audit_buffer))
                 self.audit_buffer.clear()
         except Exception as e:
             self.logger.error(f"Error flushing audit log: {e}")
@@ -3322,7 +4764,9 @@ class PublisherManager:
         self.config = config
         self.logger = logger or logging.getLogger("PublisherManager")
         self.publishers = []
-
+        # Per-publisher call targets for publish_to_all, built by _build_fanout()
+        self._fanout = None
+        self._update_system_metrics = None
         
     def initialize_publishers(self):
         """Initialize all configured publishers."""
@@ -3426,6 +4870,7 @@ class PublisherManager:
             self.publishers.append(transformation_pub)
             self.logger.info("Data Transformation publisher initialized")
         
+        self._fanout = None
         return self.publishers
     
     def start_all(self):
@@ -3436,6 +4881,8 @@ class PublisherManager:
             except Exception as e:
                 self.logger.error(f"Error starting publisher {publisher.__class__.__name__}: {e}")
         
+        self._build_fanout()
+        
         # Setup API callbacks for REST API publisher
         for publisher in self.publishers:
             if isinstance(publisher, RESTAPIPublisher):
@@ -3477,33 +4924,49 @@ class PublisherManager:
             value: Tag value
             timestamp: Optional timestamp
         """
-        for publisher in self.publishers:
+        fanout = self._fanout
+        if fanout is None:
+            fanout = self._build_fanout()
+        
+        for publish, class_name, on_success, on_error in fanout:
             try:
-                publisher.publish(tag_name, value, timestamp)
-                
-                # Update Prometheus metrics for successful publish
-                if isinstance(publisher, PrometheusPublisher):
-                    continue  # Don't record metrics publisher itself
-                    
-                prometheus_pub = self._get_prometheus_publisher()
-                if prometheus_pub:
-                    publisher_name = publisher.__class__.__name__.replace('Publisher', '')
-                    prometheus_pub.record_publisher_message(publisher_name)
-                    
+                publish(tag_name, value, timestamp)
+                if on_success is not None:
+                    on_success()
             except Exception as e:
-                self.logger.error(f"Error publishing to {publisher.__class__.__name__}: {e}")
-                
-                # Record error in Prometheus
-                prometheus_pub = self._get_prometheus_publisher()
-                if prometheus_pub:
-                    publisher_name = publisher.__class__.__name__.replace('Publisher', '')
-                    prometheus_pub.record_publisher_error(publisher_name)
+                self.logger.error(f"Error publishing to {class_name}: {e}")
+                if on_error is not None:
+                    on_error()
         
         # Update system metrics
-        prometheus_pub = self._get_prometheus_publisher()
-        if prometheus_pub:
+        if self._update_system_metrics is not None:
             # Count unique tags (would need to track this properly in real implementation)
-            prometheus_pub.update_system_metrics(tags_count=1)  # Placeholder
+            self._update_system_metrics(tags_count=1)  # Placeholder
+    
+    def _build_fanout(self) -> tuple:
+        """
+        Resolve, once, everything publish_to_all needs per publisher.
+        
+        Returns:
+            Tuple of (publish, class name, success callback, error callback);
+            the callbacks record Prometheus metrics and are None without it
+        """
+        prometheus_pub = self._get_prometheus_publisher()
+        fanout = []
+        for publisher in self.publishers:
+            class_name = publisher.__class__.__name__
+            publisher_name = class_name.replace('Publisher', '')
+            on_success = on_error = None
+            if prometheus_pub:
+                # Don't record metrics for the metrics publisher itself
+                if publisher is not prometheus_pub:
+                    on_success = functools.partial(prometheus_pub.record_publisher_message, publisher_name)
+                on_error = functools.partial(prometheus_pub.record_publisher_error, publisher_name)
+            fanout.append((publisher.publish, class_name, on_success, on_error))
+        
+        self._fanout = tuple(fanout)
+        self._update_system_metrics = prometheus_pub.update_system_metrics if prometheus_pub else None
+        return self._fanout
     
     def _get_prometheus_publisher(self):
         """Get the Prometheus publisher instance."""
@@ -4,71 +4,192 @@ Test script to verify MQTT and REST API publishing functionality
 Run this after starting the OPC UA server with publishers enabled
 """
 
+import atexit
+import functools
+import os
+import sys
 import time
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import paho.mqtt.client as mqtt
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from threading import Event
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Test configuration
 MQTT_BROKER = "localhost"
 MQTT_PORT = 1883
-MQTT_TOPIC = "industrial/opcua/#"
+MQTT_KEEPALIVE = 60
+MQTT_WAIT = 10
+# Upper bound on each client.loop() select, so the wait deadline is checked often
+MQTT_LOOP_TIMEOUT = 0.05
+# (topic filter, qos) pairs, subscribed together in a single SUBSCRIBE packet
+MQTT_TOPICS = [("industrial/opcua/#", 0)]
 REST_API_URL = "http://localhost:5000/api"
+DEBUG = bool(os.environ.get("DEBUG"))
+# Run REST first and skip MQTT if it fails, instead of running both in parallel
+FAIL_FAST = os.environ.get("FAIL_FAST") == "1"
+
+# Output templates for the per-message and per-result lines
+_MQTT_FMT = "📨 MQTT: %s → %s".__mod__
+_RESULT_FMT = "%-20s: %s".__mod__
+
+# Static banners, encoded once and written straight to the stdout buffer
+BANNER = ("=" * 60 + "\n").encode()
+
+
+def _header(title):
+    return ("\n" + "=" * 60 + "\n" + title + "\n" + "=" * 60 + "\n").encode()
+
+
+HEADER_MQTT = _header("Testing MQTT Publisher")
+HEADER_REST = _header("Testing REST API Publisher")
+HEADER_SUITE = _header("OPC UA Server Publisher Test Suite")
+HEADER_SUMMARY = _header("Test Results Summary")
+
+
+def write_banner(banner):
+    """Write pre-encoded banner bytes, keeping order with earlier print() output"""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(banner)
+
 
-# Global flags for test results
-mqtt_received = Event()
-rest_api_working = Event()
-mqtt_messages = []
+# Shared HTTP session so the REST checks reuse one keep-alive connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
+# url -> (ETag, parsed body), so repeated runs can revalidate instead of re-fetching
+_ETAGS = {}
 
 
 def on_connect(client, userdata, flags, rc):
     """MQTT connection callback"""
     if rc == 0:
         print("✅ Connected to MQTT broker")
-        client.subscribe(MQTT_TOPIC)
-        print(f"✅ Subscribed to {MQTT_TOPIC}")
+        client.subscribe(MQTT_TOPICS)
+        print(f"✅ Subscribed to {', '.join(topic for topic, _ in MQTT_TOPICS)}")
     else:
         print(f"❌ Failed to connect to MQTT broker (rc={rc})")
+        # Nothing will arrive, so release test_mqtt instead of letting it time out
+        userdata.event.set()
+
+
+@dataclass
+class MqttCtx:
+    """Per-run MQTT test state, handed to the callbacks as client userdata"""
+    event: Event = field(default_factory=Event)
+    # Received messages as parallel lists, indexed by arrival order
+    topics: list = field(default_factory=list)
+    payloads: list = field(default_factory=list)
+
+
+@functools.lru_cache(maxsize=1024)
+def topic_wanted(topic: str) -> bool:
+    """Whether a topic matches any of MQTT_TOPICS, cached per topic"""
+    return any(mqtt.topic_matches_sub(sub, topic) for sub, _ in MQTT_TOPICS)
+
+
+class LazyPayload:
+    """MQTT payload that is only decoded the first time it is accessed"""
+
+    __slots__ = ("_raw", "_data")
+
+    def __init__(self, raw):
+        self._raw = raw
+        self._data = None
+
+    def decode(self):
+        if self._data is None:
+            self._data = _json_loads(self._raw)
+        return self._data
+
+    def __getitem__(self, key):
+        return self.decode()[key]
+
+    def __repr__(self):
+        return repr(self.decode())
 
 
 def on_message(client, userdata, msg):
-    """MQTT message callback"""
-    global mqtt_messages
+    """MQTT message callback, only the first delivery is recorded"""
+    if userdata.event.is_set() or not topic_wanted(msg.topic):
+        return
     try:
-        topic = msg.topic
-        payload = json.loads(msg.payload.decode())
-        mqtt_messages.append({
-            "topic": topic,
-            "payload": payload
-        })
-        print(f"📨 MQTT: {topic} → {payload}")
-        mqtt_received.set()
+        payload = LazyPayload(msg.payload)
+        userdata.topics.append(msg.topic)
+        userdata.payloads.append(payload)
+        if DEBUG:
+            print(_MQTT_FMT((msg.topic, payload)))
+        userdata.event.set()
+        # One message is enough to pass, stop the broker sending more
+        client.unsubscribe([topic for topic, _ in MQTT_TOPICS])
     except Exception as e:
         print(f"❌ Error parsing MQTT message: {e}")
 
 
+# (broker, port) -> connected subscriber, reused by repeated test_mqtt runs
+_MQTT_POOL = {}
+
+
+def get_client(broker, port, ctx):
+    """Connected MQTT subscriber for broker:port bound to ctx, reusing a pooled one"""
+    client = _MQTT_POOL.get((broker, port))
+    if client is None:
+        client = mqtt.Client(client_id="test_subscriber", userdata=ctx)
+        client.on_connect = on_connect
+        client.on_message = on_message
+        client.connect(broker, port, MQTT_KEEPALIVE)
+        _MQTT_POOL[(broker, port)] = client
+        return client
+    
+    client.user_data_set(ctx)
+    if client.is_connected():
+        # on_message unsubscribed after the previous run's first delivery
+        client.subscribe(MQTT_TOPICS)
+    else:
+        client.reconnect()
+    return client
+
+
+@atexit.register
+def _close_mqtt_pool():
+    for client in _MQTT_POOL.values():
+        client.disconnect()
+    _MQTT_POOL.clear()
+
+
 def test_mqtt():
     """Test MQTT publishing"""
-    print("\n" + "="*60)
-    print("Testing MQTT Publisher")
-    print("="*60)
-    
-    client = mqtt.Client(client_id="test_subscriber")
-    client.on_connect = on_connect
-    client.on_message = on_message
+    write_banner(HEADER_MQTT)
     
+    ctx = MqttCtx()
+    ok = False
     try:
-        client.connect(MQTT_BROKER, MQTT_PORT, 60)
-        client.loop_start()
+        client = get_client(MQTT_BROKER, MQTT_PORT, ctx)
         
-        # Wait for messages
-        print("⏳ Waiting for MQTT messages (10 seconds)...")
-        mqtt_received.wait(timeout=10)
+        # Wait for messages, driving the network loop on this thread rather
+        # than starting paho's background loop thread
+        print(f"⏳ Waiting for MQTT messages ({MQTT_WAIT} seconds)...")
+        deadline = time.monotonic() + MQTT_WAIT
+        ok = True
+        while not ctx.event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if client.loop(timeout=min(remaining, MQTT_LOOP_TIMEOUT)) != mqtt.MQTT_ERR_SUCCESS:
+                ok = False
+                break
         
-        if mqtt_messages:
-            print(f"\n✅ MQTT Test PASSED - Received {len(mqtt_messages)} messages")
-            print(f"   Sample: {mqtt_messages[0]['topic']}")
+        if ctx.topics:
+            print(f"\n✅ MQTT Test PASSED - Received {len(ctx.topics)} messages")
+            print(f"   Sample: {ctx.topics[0]}")
             return True
         else:
             print("\n❌ MQTT Test FAILED - No messages received")
@@ -78,49 +199,71 @@ def test_mqtt():
         print(f"❌ MQTT Test FAILED - {e}")
         return False
     finally:
-        client.loop_stop()
-        client.disconnect()
+        if not ok:
+            # Don't hand a broken connection to the next run
+            client = _MQTT_POOL.pop((MQTT_BROKER, MQTT_PORT), None)
+            if client is not None:
+                client.disconnect()
+
+
+def wait_ready(url, deadline=5.0):
+    """Poll url until it answers 200, backing off between attempts"""
+    start = time.monotonic()
+    delay = 0.02
+    while time.monotonic() - start < deadline:
+        try:
+            if SESSION.get(url, timeout=0.5).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 1.6, 0.25)
+    return False
 
 
 def test_rest_api():
     """Test REST API"""
-    print("\n" + "="*60)
-    print("Testing REST API Publisher")
-    print("="*60)
+    write_banner(HEADER_REST)
     
     try:
         # Test health endpoint
         print(f"⏳ Testing {REST_API_URL}/health...")
-        response = requests.get(f"{REST_API_URL}/health", timeout=5)
+        response = SESSION.get(f"{REST_API_URL}/health", timeout=5)
         
         if response.status_code == 200:
-            print(f"✅ Health check: {response.json()}")
+            print(f"✅ Health check: {_json_loads(response.content)}")
         else:
             print(f"❌ Health check failed: {response.status_code}")
             return False
         
-        # Test get all tags
+        # Test tag listing (names only, values are fetched per tag below)
         print(f"\n⏳ Testing {REST_API_URL}/tags...")
-        response = requests.get(f"{REST_API_URL}/tags", timeout=5)
+        url = f"{REST_API_URL}/tags"
+        etag, data = _ETAGS.get(url, (None, None))
+        response = SESSION.get(url, params={"fields": "names"},
+                               headers={"If-None-Match": etag} if etag else None, timeout=5)
         
-        if response.status_code == 200:
-            data = response.json()
+        if response.status_code in (200, 304):
+            if response.status_code == 200:
+                data = _json_loads(response.content)
+                if response.headers.get("ETag"):
+                    _ETAGS[url] = (response.headers["ETag"], data)
             tag_count = data.get('count', 0)
             print(f"✅ Retrieved {tag_count} tags")
             
             # Display sample tags
-            tags = data.get('tags', {})
-            for i, (tag_name, tag_data) in enumerate(list(tags.items())[:3]):
-                print(f"   • {tag_name}: {tag_data['value']} (ts: {tag_data['timestamp']})")
+            tags = data.get('tags', [])
+            for tag_name in tags[:3]:
+                print(f"   • {tag_name}")
             
             if tag_count > 0:
                 # Test get specific tag
-                first_tag = list(tags.keys())[0]
+                first_tag = tags[0]
                 print(f"\n⏳ Testing specific tag: {REST_API_URL}/tags/{first_tag}...")
-                response = requests.get(f"{REST_API_URL}/tags/{first_tag}", timeout=5)
+                response = SESSION.get(f"{REST_API_URL}/tags/{first_tag}", timeout=5)
                 
                 if response.status_code == 200:
-                    tag_data = response.json()
+                    tag_data = _json_loads(response.content)
                     print(f"✅ {first_tag}: {tag_data}")
                     print(f"\n✅ REST API Test PASSED")
                     return True
@@ -145,34 +288,38 @@ def test_rest_api():
 
 def main():
     """Run all tests"""
-    print("\n" + "="*60)
-    print("OPC UA Server Publisher Test Suite")
-    print("="*60)
+    write_banner(HEADER_SUITE)
     print("\nPrerequisites:")
     print("1. OPC UA server must be running")
     print("2. Run with: python opcua_server.py -c config/config_with_mqtt.json")
     print("3. MQTT broker must be running on localhost:1883")
-    print("\nStarting tests in 3 seconds...")
-    time.sleep(3)
-    
-    results = {}
-    
-    # Test REST API
-    results['REST API'] = test_rest_api()
-    time.sleep(1)
+    print("\nWaiting for the server to become ready...")
+    if not wait_ready(f"{REST_API_URL}/health"):
+        print(f"⚠️  {REST_API_URL}/health not ready, running tests anyway")
     
-    # Test MQTT
-    results['MQTT'] = test_mqtt()
+    if FAIL_FAST:
+        # REST fails within seconds while MQTT can wait out its full timeout
+        results = {'REST API': test_rest_api()}
+        if results['REST API']:
+            results['MQTT'] = test_mqtt()
+        else:
+            print("\n⚠️  FAIL_FAST set, skipping MQTT test")
+    else:
+        # Both checks are I/O bound, so run them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                'REST API': executor.submit(test_rest_api),
+                'MQTT': executor.submit(test_mqtt),
+            }
+            results = {name: future.result() for name, future in futures.items()}
     
-    # Summary
-    print("\n" + "="*60)
-    print("Test Results Summary")
-    print("="*60)
+    # Summary, in execution order
+    write_banner(HEADER_SUMMARY)
     for test_name, passed in results.items():
         status = "✅ PASSED" if passed else "❌ FAILED"
-        print(f"{test_name:20s}: {status}")
+        print(_RESULT_FMT((test_name, status)))
     
-    print("="*60)
+    write_banner(BANNER)
     
     # Exit code
     all_passed = all(results.values())